@@ -0,0 +1,139 @@
+"""Rafraîchissement des données du tableau de bord, hors des pages Streamlit
+
+Utilisation (depuis le dossier du projet) :
+    python refresh.py                # une construction, puis sortie
+    python refresh.py --every 30m    # en continu, toutes les 30 minutes
+    python refresh.py --force        # toutes les sources, même celles encore fraîches
+    python refresh.py --source "data.gouv.fr"   # réinterroge ces sources, même fraîches
+
+Chaque construction interroge les sources dont le TTL est dépassé, fusionne
+avec le dernier résultat en cache des autres, traite les données avec
+process_funds_data et publie une nouvelle version du snapshot, que le
+tableau de bord se contente de lire. Le bouton « Actualiser » du tableau de
+bord invalide une source ou toutes (utils.source_registry.invalidate_sources)
+et réveille ce processus.
+"""
+
+import argparse
+import re
+import sys
+import time
+from functools import partial
+from scraper import europe_direct_guadeloupe, data_gouv_guadeloupe, region_guadeloupe
+from utils.data_processor import process_funds_data, SCHEMA_VERSION
+from utils.concurrent_fetch import fetch_all_sources
+from utils.snapshot_cache import build_snapshot, current_snapshot, refresh_requested, clear_refresh_request
+from utils.source_registry import plan_refresh, refresh_source, merge_results, next_due, invalidate_sources
+
+# Sources déclarées par les scrapers, chacune avec son TTL, son coût et sa priorité
+SOURCES = [europe_direct_guadeloupe.SOURCE, data_gouv_guadeloupe.SOURCE, region_guadeloupe.SOURCE]
+
+# Clé des snapshots publiés pour ce territoire
+SNAPSHOT_KEY = "guadeloupe"
+
+# Intervalle de vérification des demandes d'actualisation du tableau de bord (en secondes)
+REQUEST_POLL = 5
+
+def build_dataset(force=False, demande=None):
+    """Interroge les sources arrivées à échéance et fusionne avec le cache des autres
+
+    Chaque source est rafraîchie selon son propre TTL (utils.source_registry) ;
+    `force` les interroge toutes, sauf celles rafraîchies par un autre
+    processus depuis `demande` (horodatage de la demande, par défaut
+    maintenant), en ignorant leurs caches propres (fichiers déjà parsés). Retourne (DataFrame ou None, résumé par source), tel
+    qu'attendu par utils.snapshot_cache ; None quand aucune source n'a pu
+    être actualisée alors qu'un snapshot est déjà publié.
+    """
+
+    # Les sources dues sont interrogées en même temps, chacune avec son propre délai ; une
+    # source déjà interrogée par un autre processus n'est pas réinterrogée (refresh_source)
+    demande = demande or time.time()
+    dues = plan_refresh(SNAPSHOT_KEY, SOURCES, force=force, depuis=demande)
+    results = fetch_all_sources([
+        (src['nom'], partial(refresh_source, SNAPSHOT_KEY, src, demande, force), src['delai']) for src in dues
+    ])
+
+    # Un lot par source (DataFrame en cache), rangé lot par lot par process_funds_data
+    lots, sources = merge_results(SNAPSHOT_KEY, SOURCES, results)
+
+    if not lots:
+        return None, sources
+
+    # Toutes les sources interrogées ont échoué : rien de neuf à publier, le snapshot en
+    # place reste servi avec son horodatage et l'échec est enregistré (build_snapshot)
+    if results and not any(source['rafraichi'] for source in sources) and snapshot_is_current():
+        return None, sources
+
+    return process_funds_data(lots), sources
+
+def snapshot_is_current():
+    """Le snapshot publié existe et suit le schéma actuel de process_funds_data"""
+    snapshot = current_snapshot(SNAPSHOT_KEY)
+    return snapshot is not None and snapshot['donnees'].attrs.get('schema') == SCHEMA_VERSION
+
+def refresh_once(force=False):
+    """Construit et publie un snapshot ; retourne True en cas de succès
+
+    Sans `force`, rien n'est reconstruit tant qu'aucune source n'a dépassé son TTL
+    et que le snapshot publié suit le schéma actuel de process_funds_data.
+    """
+    if not force and next_due(SNAPSHOT_KEY, SOURCES) > 0 and snapshot_is_current():
+        print(f"[{SNAPSHOT_KEY}] Aucune source à rafraîchir, snapshot actuel conservé")
+        return True
+
+    # Horodatage pris avant l'attente éventuelle d'une construction en cours dans un autre processus
+    demande = time.time()
+    start = time.monotonic()
+    snapshot, erreur = build_snapshot(SNAPSHOT_KEY, lambda: build_dataset(force, demande))
+    duree = time.monotonic() - start
+
+    if snapshot is None:
+        print(f"[{SNAPSHOT_KEY}] Échec après {duree:.1f}s ({erreur}), snapshot précédent conservé")
+        return False
+
+    rafraichies = [source['nom'] for source in snapshot['sources'] if source.get('rafraichi')]
+    ecartes = snapshot['donnees'].attrs.get('validation', {}).get('rejetees', 0)
+    print(f"[{SNAPSHOT_KEY}] Version {snapshot['version']} publiée : {len(snapshot['donnees'])} projets en {duree:.1f}s, "
+          f"{ecartes} écartés à la validation (rafraîchies : {', '.join(rafraichies) or 'aucune'})")
+    return True
+
+def parse_interval(texte):
+    """Durée en secondes depuis '90', '90s', '30m' ou '2h'"""
+    match = re.fullmatch(r'\s*(\d+)\s*([smh]?)\s*', texte)
+    if not match:
+        raise argparse.ArgumentTypeError(f"intervalle invalide : {texte!r} (ex. 30m, 2h, 90s)")
+    return int(match.group(1)) * {'': 1, 's': 1, 'm': 60, 'h': 3600}[match.group(2)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--every', type=parse_interval, help="intervalle entre deux constructions (ex. 30m)")
+    parser.add_argument('--force', action='store_true', help="interroger toutes les sources, même celles encore fraîches")
+    parser.add_argument('--source', nargs='+', metavar='NOM', help=f"sources à réinterroger : {', '.join(src['nom'] for src in SOURCES)}")
+    args = parser.parse_args()
+
+    if args.source:
+        inconnues = [nom for nom in args.source if nom not in [src['nom'] for src in SOURCES]]
+        if inconnues:
+            parser.error(f"source inconnue : {', '.join(inconnues)}")
+        invalidate_sources(SNAPSHOT_KEY, SOURCES, args.source, cooldown=0)
+
+    if not args.every:
+        return 0 if refresh_once(args.force) else 1
+
+    try:
+        force = args.force
+        while True:
+            clear_refresh_request(SNAPSHOT_KEY)
+            refresh_once(force)
+            force = False
+
+            # Attente de la prochaine échéance (intervalle ou TTL d'une source, au plus tôt),
+            # écourtée par le bouton « Actualiser » du tableau de bord, qui invalide les sources choisies
+            deadline = time.monotonic() + min(args.every, max(REQUEST_POLL, next_due(SNAPSHOT_KEY, SOURCES)))
+            while time.monotonic() < deadline and not refresh_requested(SNAPSHOT_KEY):
+                time.sleep(min(REQUEST_POLL, max(0, deadline - time.monotonic())))
+    except KeyboardInterrupt:
+        return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,53 +1,60 @@
-import requests
-from bs4 import BeautifulSoup
 import pandas as pd
 from datetime import datetime
 import re
+from utils.http_session import http_get
+from utils.html_parsing import find_candidate_blocks
+from utils.keyword_classifier import compile_taxonomy, classify
+from utils.source_registry import source
+from utils.record_ids import record_id
+from scraper.taxonomie_guadeloupe import EUROPE_DIRECT
+
+# Compilé une fois à l'import : programme et secteur sont déduits en un seul appel, texte mis en minuscules une fois
+CLASSIFIEUR = compile_taxonomy(EUROPE_DIRECT)
+
+# Éléments portant le titre d'un projet : un bloc retenu doit en contenir un
+BALISES_TITRE = ['h2', 'h3', 'h4', 'strong']
 
 def scrape_europe_direct_guadeloupe():
     """Scrape le site Europe Direct Guadeloupe pour les fonds européens"""
     
-    try:
-        # URL Europe Direct Guadeloupe - Fonds Européens
-        url = "https://www.europe-direct-guadeloupe.fr/les-fonds-europeens/"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        projects_data = []
-        
-        # Recherche des sections de projets
-        project_sections = soup.find_all('div', class_=re.compile(r'project|fond|programme'))
-        
-        for section in project_sections[:20]:  # Limiter à 20 projets
-            try:
-                project_data = extract_project_data(section)
-                if project_data:
-                    projects_data.append(project_data)
-            except Exception as e:
-                continue
-        
-        # Si pas de données trouvées, générer des données simulées basées sur des vrais projets
-        if not projects_data:
-            projects_data = generate_europe_direct_fallback()
-        
-        return projects_data
-        
-    except Exception as e:
-        print(f"Erreur scraping Europe Direct Guadeloupe: {e}")
-        return generate_europe_direct_fallback()
+    # URL Europe Direct Guadeloupe - Fonds Européens
+    url = "https://www.europe-direct-guadeloupe.fr/les-fonds-europeens/"
+    
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+    
+    response = http_get(url, headers=headers, timeout=10)
+    response.raise_for_status()
+    
+    projects_data = []
+    
+    # Recherche des sections de projets (seuls ces blocs sont parsés, avec lxml).
+    # Les div imbriquées correspondent souvent toutes au motif : on ne garde que les
+    # plus internes contenant un titre et un montant, pour ne lire chaque texte qu'une fois
+    # et ne pas dupliquer un projet sans perdre la carte autour d'une étiquette ou d'un montant
+    project_sections = find_candidate_blocks(response.content, 'div', r'project|fond|programme', mode='innermost',
+                                             contains='€', containing_tags=BALISES_TITRE)
+    
+    for section in project_sections[:20]:  # Limiter à 20 projets
+        try:
+            project_data = extract_project_data(section)
+            if project_data:
+                projects_data.append(project_data)
+        except Exception as e:
+            continue
+    
+    # Aucun projet reconnu : la structure de la page a changé, la source est en échec
+    if not projects_data:
+        raise ValueError("aucun projet trouvé sur la page")
+    
+    return projects_data
 
 def extract_project_data(section):
     """Extract les données d'un projet depuis une section HTML"""
     
     # Essayer de trouver le titre
-    title_elem = section.find(['h2', 'h3', 'h4', 'strong'])
+    title_elem = section.find(BALISES_TITRE)
     title = title_elem.get_text().strip() if title_elem else "Projet Fonds Européen"
     
     # Chercher des montants dans le texte
@@ -55,17 +62,16 @@ def extract_project_data(section):
     montant_match = re.search(r'(\d{1,3}(?:\s?\d{3})*(?:\s?\d{3})?)\s?€', text_content)
     montant = float(montant_match.group(1).replace(' ', '')) if montant_match else None
     
-    # Déduire le programme basé sur le contenu
-    programme = deduce_programme(text_content)
-    
-    # Déduire le secteur
-    secteur = deduce_secteur(text_content)
+    # Déduire le programme et le secteur basés sur le contenu
+    categories = classify(text_content, CLASSIFIEUR)
+    programme = categories['programme']
+    secteur = categories['secteur']
     
     if not montant:
         return None
     
     return {
-        'id': f"ED_{hash(title) % 10000:04d}",
+        'id': record_id('ED', 'Europe Direct Guadeloupe', title, montant),
         'titre': title,
         'programme': programme,
         'secteur': secteur,
@@ -82,37 +88,11 @@ def extract_project_data(section):
 
 def deduce_programme(text):
     """Déduit le programme basé sur le contenu textuel"""
-    text_lower = text.lower()
-    
-    if 'feder' in text_lower or 'développement régional' in text_lower:
-        return 'FEDER'
-    elif 'fse' in text_lower or 'social' in text_lower:
-        return 'FSE'
-    elif 'feader' in text_lower or 'agricole' in text_lower:
-        return 'FEADER'
-    elif 'interreg' in text_lower or 'coopération' in text_lower:
-        return 'INTERREG'
-    else:
-        return 'FEDER'  # Par défaut
+    return classify(text, CLASSIFIEUR)['programme']
 
 def deduce_secteur(text):
     """Déduit le secteur basé sur le contenu textuel"""
-    text_lower = text.lower()
-    
-    if any(word in text_lower for word in ['agriculture', 'agri', 'rural']):
-        return 'Agriculture'
-    elif any(word in text_lower for word in ['tourisme', 'touristique']):
-        return 'Tourisme'
-    elif any(word in text_lower for word in ['recherche', 'innovation', 'numérique']):
-        return 'Recherche'
-    elif any(word in text_lower for word in ['formation', 'emploi', 'social']):
-        return 'Formation'
-    elif any(word in text_lower for word in ['environnement', 'énergie', 'durable']):
-        return 'Environnement'
-    elif any(word in text_lower for word in ['transport', 'mobilité', 'infrastructure']):
-        return 'Transport'
-    else:
-        return 'Développement régional'
+    return classify(text, CLASSIFIEUR)['secteur']
 
 def generate_europe_direct_fallback():
     """Génère des données de fallback réalistes pour Europe Direct Guadeloupe"""
@@ -162,4 +142,7 @@ def generate_europe_direct_fallback():
             'source': 'Europe Direct Guadeloupe (données de référence)'
         })
     
-    return data
\ No newline at end of file
+    return data
+
+# Déclaration pour le registre des sources. Page de présentation : change rarement
+SOURCE = source("Europe Direct", scrape_europe_direct_guadeloupe, ttl=6 * 3600, cout=1, priorite=2, secours=generate_europe_direct_fallback)
@@ -0,0 +1,61 @@
+from utils.keyword_classifier import commune_rules
+
+# Taxonomies de classement des projets (Guadeloupe)
+# Chaque axe liste ses règles par ordre de priorité : la première règle dont un
+# mot-clé apparaît dans le texte l'emporte, sinon le libellé par défaut est utilisé.
+
+COMMUNES = [
+    'Les Abymes', 'Baie-Mahault', 'Le Gosier', 'Pointe-à-Pitre', 'Basse-Terre',
+    'Sainte-Anne', 'Le Moule', 'Petit-Bourg', 'Sainte-Rose', 'Capesterre-Belle-Eau'
+]
+
+EUROPE_DIRECT = {
+    'programme': {
+        'regles': [
+            ('FEDER', ['feder', 'développement régional']),
+            ('FSE', ['fse', 'social']),
+            ('FEADER', ['feader', 'agricole']),
+            ('INTERREG', ['interreg', 'coopération'])
+        ],
+        'defaut': 'FEDER'
+    },
+    'secteur': {
+        'regles': [
+            ('Agriculture', ['agriculture', 'agri', 'rural']),
+            ('Tourisme', ['tourisme', 'touristique']),
+            ('Recherche', ['recherche', 'innovation', 'numérique']),
+            ('Formation', ['formation', 'emploi', 'social']),
+            ('Environnement', ['environnement', 'énergie', 'durable']),
+            ('Transport', ['transport', 'mobilité', 'infrastructure'])
+        ],
+        'defaut': 'Développement régional'
+    }
+}
+
+REGION = {
+    'programme': {
+        'regles': [
+            ('FEDER', ['feder']),
+            ('FSE', ['fse']),
+            ('FEADER', ['feader']),
+            ('INTERREG', ['interreg'])
+        ],
+        'defaut': 'FEDER'
+    },
+    'secteur': {
+        'regles': [
+            ('Agriculture', ['agriculture', 'agri', 'rural', 'filière', 'canne', 'banane']),
+            ('Tourisme', ['tourisme', 'touristique', 'hôtellerie', 'croisière']),
+            ('Formation', ['formation', 'emploi', 'compétence', 'insertion']),
+            ('Environnement', ['environnement', 'énergie', 'renouvelable', 'durable', 'marin']),
+            ('Recherche', ['recherche', 'innovation', 'numérique', 'technologie']),
+            ('Transport', ['transport', 'mobilité', 'infrastructure', 'port', 'aéroport']),
+            ('Santé', ['santé', 'médical', 'social'])
+        ],
+        'defaut': 'Développement régional'
+    },
+    'commune': {
+        'regles': commune_rules(COMMUNES),
+        'defaut': 'Guadeloupe'
+    }
+}
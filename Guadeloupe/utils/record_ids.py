@@ -0,0 +1,68 @@
+import math
+import unicodedata
+from hashlib import blake2b
+import numpy as np
+import pandas as pd
+
+# Séparateur des champs dans le texte canonique haché (caractère de contrôle, absent des textes)
+SEPARATOR = '\x1f'
+
+def record_id(prefixe, *champs):
+    """Identifiant stable d'un projet : préfixe de la source et 64 bits de blake2b
+
+    L'empreinte porte sur le préfixe et les champs canoniques (source, titre,
+    montant...) : le même contenu donne le même identifiant à chaque exécution,
+    dans tous les processus et tous les territoires, contrairement à hash(),
+    salé à chaque démarrage. Ex. record_id('ED', 'Europe Direct Réunion', titre, montant)
+    -> 'ED_3f2a9c0d41b7e865'.
+    """
+    texte = SEPARATOR.join([prefixe] + [_canonical(valeur) for valeur in champs])
+    return f"{prefixe}_{blake2b(texte.encode('utf-8'), digest_size=8).hexdigest()}"
+
+def frame_ids(prefixe, source, df, vus=None):
+    """Identifiants des lignes d'une ressource : source, colonnes lues et rang des doublons
+
+    Calcul vectorisé (pd.util.hash_pandas_object, clé dérivée du préfixe et
+    de `source`, l'URL de la ressource) sur les colonnes de `df` telles que
+    lues dans le fichier, prises dans l'ordre de leur nom pour qu'un fichier
+    dont les colonnes changent de place garde les mêmes identifiants. Les
+    lignes identiques d'une même ressource sont distinguées par leur rang
+    d'apparition : `vus` compte les lignes déjà rencontrées, à partager entre
+    les morceaux d'un même fichier. Même format que record_id : préfixe et
+    16 chiffres hexadécimaux.
+    """
+    cle = blake2b(SEPARATOR.join([prefixe, _canonical(source)]).encode('utf-8'), digest_size=8).hexdigest()
+    vus = {} if vus is None else vus
+
+    # Chaque valeur distincte d'une colonne n'est hachée qu'une fois
+    colonnes = sorted(range(df.shape[1]), key=lambda position: (str(df.columns[position]), position))
+    hachages = {}
+    for rang_colonne, position in enumerate(colonnes):
+        codes, uniques = pd.factorize(df.iloc[:, position], use_na_sentinel=False)
+        hachages[rang_colonne] = pd.util.hash_array(np.asarray(uniques, dtype=object), hash_key=cle, categorize=False)[codes]
+
+    if hachages:
+        empreintes = pd.util.hash_pandas_object(pd.DataFrame(hachages), index=False, hash_key=cle)
+    else:
+        # Aucune colonne : seules les positions distinguent les lignes
+        empreintes = pd.Series(np.zeros(len(df), dtype='uint64'))
+
+    # Rang de chaque ligne parmi les lignes identiques, morceaux précédents compris
+    rang = empreintes.groupby(empreintes).cumcount().astype('uint64')
+    if vus:
+        rang += empreintes.map(vus).fillna(0).astype('uint64')
+    dernieres = ~empreintes.duplicated(keep='last')
+    vus.update(zip(empreintes[dernieres].tolist(), (rang[dernieres] + 1).tolist()))
+
+    ids = pd.util.hash_pandas_object(pd.DataFrame({'empreinte': empreintes, 'rang': rang}), index=False, hash_key=cle)
+    hexa = np.frombuffer(ids.to_numpy().astype('>u8').tobytes().hex().encode('ascii'), dtype='S16').astype(str)
+    return np.char.add(f"{prefixe}_", hexa)
+
+def _canonical(valeur):
+    # Vide, nombres entiers écrits sans décimale, Unicode NFC, espaces réduits, casse ignorée
+    if valeur is None or (isinstance(valeur, float) and math.isnan(valeur)):
+        return ''
+    if isinstance(valeur, float) and valeur.is_integer():
+        valeur = int(valeur)
+    texte = unicodedata.normalize('NFC', str(valeur))
+    return ' '.join(texte.split()).casefold()
@@ -4,10 +4,12 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import numpy as np
-from scraper.europe_direct_guyane import scrape_europe_direct_guyane
-from scraper.data_gouv_guyane import scrape_data_gouv_guyane
-from scraper.region_guyane import scrape_region_guyane
-from utils.data_processor import process_funds_data
+import os
+from utils.snapshot_cache import get_snapshot, refresh_snapshot, request_refresh, snapshot_status, format_age
+from utils.source_registry import invalidate_sources
+from utils.host_health import host_report
+from utils.data_processor import process_funds_data, format_euros, with_euros, SCHEMA_VERSION
+from refresh import SNAPSHOT_KEY, SOURCES, build_dataset
 import time
 
 # Configuration de la page
@@ -56,55 +58,117 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-@st.cache_data(ttl=3600)  # Cache pour 1 heure
+# Les données sont construites et publiées par refresh.py ; le tableau de bord ne fait que lire
+# le dernier snapshot. Pour un déploiement sans refresh.py, FONDS_EUROPEENS_EMBEDDED_REFRESH=1
+# reconstruit le snapshot en arrière-plan dans le processus Streamlit.
+EMBEDDED_REFRESH = os.environ.get('FONDS_EUROPEENS_EMBEDDED_REFRESH') == '1'
+
+# Choix « toutes les sources » du bouton d'actualisation
+TOUTES_SOURCES = "Toutes les sources"
+
 def load_real_time_data():
-    """Charge les données en temps réel depuis les sources officielles"""
-    
-    st.sidebar.info("🔄 Chargement des données en cours...")
-    
-    all_data = []
-    
-    try:
-        # Scraping Europe Direct Guyane
-        with st.spinner("Récupération des données Europe Direct..."):
-            europe_direct_data = scrape_europe_direct_guyane()
-            if europe_direct_data:
-                all_data.extend(europe_direct_data)
-                st.sidebar.success(f"✅ Europe Direct: {len(europe_direct_data)} projets")
-            else:
-                st.sidebar.warning("❌ Europe Direct: Données temporairement indisponibles")
-    except Exception as e:
-        st.sidebar.error(f"❌ Erreur Europe Direct: {str(e)}")
-    
-    try:
-        # Scraping data.gouv.fr
-        with st.spinner("Récupération des données data.gouv.fr..."):
-            data_gouv_data = scrape_data_gouv_guyane()
-            if data_gouv_data:
-                all_data.extend(data_gouv_data)
-                st.sidebar.success(f"✅ data.gouv.fr: {len(data_gouv_data)} projets")
-            else:
-                st.sidebar.warning("❌ data.gouv.fr: Données temporairement indisponibles")
-    except Exception as e:
-        st.sidebar.error(f"❌ Erreur data.gouv.fr: {str(e)}")
-    
-    try:
-        # Scraping Région Guyane
-        with st.spinner("Récupération des données Région Guyane..."):
-            region_data = scrape_region_guyane()
-            if region_data:
-                all_data.extend(region_data)
-                st.sidebar.success(f"✅ Région Guyane: {len(region_data)} projets")
-            else:
-                st.sidebar.warning("❌ Région Guyane: Données temporairement indisponibles")
-    except Exception as e:
-        st.sidebar.error(f"❌ Erreur Région Guyane: {str(e)}")
-    
-    if not all_data:
-        st.error("Aucune donnée n'a pu être récupérée. Utilisation des données de démonstration.")
+    """Lit le dernier snapshot publié ; aucune source n'est interrogée pendant l'affichage"""
+    
+    snapshot = get_snapshot(SNAPSHOT_KEY, build_dataset if EMBEDDED_REFRESH else None)
+    
+    if snapshot is None:
+        st.error("Aucune donnée publiée pour l'instant (lancez `python refresh.py`). Utilisation des données de démonstration.")
         return generate_fallback_data()
     
-    return process_funds_data(all_data)
+    # Snapshot publié par une version antérieure du traitement (montants en euros flottants...)
+    if snapshot['donnees'].attrs.get('schema') != SCHEMA_VERSION:
+        if EMBEDDED_REFRESH:
+            refresh_snapshot(SNAPSHOT_KEY, build_dataset)
+        st.warning("Données publiées dans un format antérieur, en attente de la prochaine actualisation. Utilisation des données de démonstration.")
+        return generate_fallback_data()
+    
+    show_data_status(snapshot)
+    show_validation_report(snapshot['donnees'])
+    show_host_health()
+    return snapshot['donnees']
+
+def request_source_refresh(noms):
+    """Invalide les sources choisies (toutes si None) et réveille leur rafraîchissement
+
+    Les sources interrogées ou déjà demandées il y a moins de
+    INVALIDATION_COOLDOWN secondes sont refusées : plusieurs clics, même
+    simultanés depuis des sessions différentes, n'interrogent la source
+    qu'une fois. Retourne (sources invalidées, {source refusée: attente}).
+    """
+    acceptees, refusees = invalidate_sources(SNAPSHOT_KEY, SOURCES, noms)
+    if acceptees:
+        if EMBEDDED_REFRESH:
+            refresh_snapshot(SNAPSHOT_KEY, build_dataset, force=True)
+        else:
+            request_refresh(SNAPSHOT_KEY)
+    return acceptees, refusees
+
+def show_refresh_request(acceptees, refusees):
+    """Affiche dans la barre latérale le résultat d'une demande d'actualisation"""
+    if acceptees:
+        st.sidebar.info(f"🔄 Actualisation demandée : {', '.join(acceptees)}")
+    for nom, attente in refusees.items():
+        st.sidebar.warning(f"⏳ {nom} est en cours d'actualisation ou a été actualisée ou demandée récemment, nouvel essai possible dans {max(1, round(attente / 60))} min")
+
+def show_data_status(snapshot):
+    """Affiche dans la barre latérale l'âge des données et l'état de chaque source"""
+    
+    horodatage = datetime.fromtimestamp(snapshot['horodatage'])
+    age = format_age(time.time() - snapshot['horodatage'])
+    st.sidebar.markdown(f"**🕒 Données du :** {horodatage.strftime('%d/%m/%Y à %H:%M')} ({age})")
+    
+    status = snapshot_status(SNAPSHOT_KEY)
+    if status['en_cours'] or status['demande']:
+        st.sidebar.info("🔄 Actualisation en arrière-plan, rechargez la page dans quelques instants")
+    elif status['echec']:
+        st.sidebar.warning(f"⚠️ Dernière actualisation échouée ({status['echec']['message']}), données précédentes conservées")
+    
+    for source in snapshot['sources']:
+        nom = source['nom']
+        # Chaque source a sa propre cadence : l'âge affiché est celui de son dernier résultat réussi
+        age_source = f" ({format_age(time.time() - source['horodatage'])})" if source.get('horodatage') else ""
+        if source.get('reference'):
+            st.sidebar.warning(f"📚 {nom}: {source['erreur'] or 'jamais récupérée'}, données de référence affichées")
+        elif source['erreur'] and source['projets']:
+            st.sidebar.warning(f"⚠️ {nom}: {source['erreur']}, {source['projets']} projets précédents conservés{age_source}")
+        elif source['erreur'] == 'timeout':
+            st.sidebar.warning(f"⏱️ {nom}: Délai dépassé, source ignorée")
+        elif source['erreur']:
+            st.sidebar.error(f"❌ Erreur {nom}: {source['erreur']}")
+        elif source['projets']:
+            st.sidebar.success(f"✅ {nom}: {source['projets']} projets{age_source}")
+        else:
+            st.sidebar.warning(f"❌ {nom}: Données temporairement indisponibles")
+
+def show_validation_report(df):
+    """Affiche dans la barre latérale les projets écartés et les valeurs corrigées, par règle et par source"""
+    
+    rapport = df.attrs.get('validation')
+    if not rapport:
+        return
+    
+    with st.sidebar.expander(f"🧪 Contrôles qualité : {rapport['rejetees']} projets écartés sur {rapport['lignes']}"):
+        regles = [regle for regle in rapport['regles'] if regle['lignes']]
+        if not regles:
+            st.caption("Aucun projet écarté ni corrigé")
+        for regle in regles:
+            icone = "🚫" if regle['action'] == 'rejet' else "✏️"
+            detail = ", ".join(f"{source} : {n}" for source, n in regle['par_source'].items())
+            st.markdown(f"{icone} {regle['description']} — **{regle['lignes']}** ({detail})")
+
+def show_host_health():
+    """Affiche dans la barre latérale l'état des hôtes interrogés : disjoncteur et latences"""
+    
+    hotes = host_report()
+    if not hotes:
+        return
+    
+    en_echec = [host for host, etat in hotes.items() if etat['etat'] != 'ferme']
+    with st.sidebar.expander(f"🌐 Hôtes interrogés : {len(en_echec)} en échec sur {len(hotes)}"):
+        for host, etat in sorted(hotes.items()):
+            icone = {'ferme': '🟢', 'semi-ouvert': '🟠'}.get(etat['etat'], '🔴')
+            latences = f"p50 {etat['p50']:.2f} s, p95 {etat['p95']:.2f} s" if etat['p50'] is not None else "latence non mesurée"
+            st.markdown(f"{icone} {host} — {latences}, {etat['echecs']} échecs consécutifs")
 
 def generate_fallback_data():
     """Génère des données de démonstration si le scraping échoue"""
@@ -145,20 +209,19 @@ def generate_fallback_data():
             "source": "Données de démonstration"
         })
     
-    return pd.DataFrame(data)
+    return process_funds_data(data)
 
 def main():
     # Titre principal
     st.markdown('<h1 class="main-header">🇪🇺 Fonds Européens - Guyane - Temps Réel</h1>', unsafe_allow_html=True)
     
-    # Information sur la dernière mise à jour
-    last_update = datetime.now().strftime("%d/%m/%Y à %H:%M")
-    st.sidebar.markdown(f"**🕒 Dernière mise à jour :** {last_update}")
-    
-    # Bouton de rafraîchissement manuel
+    # Rafraîchissement manuel ciblé : une source ou toutes, pour ce territoire seulement
+    choix = st.sidebar.selectbox("Source à actualiser", [TOUTES_SOURCES] + [source['nom'] for source in SOURCES])
     if st.sidebar.button("🔄 Actualiser les données"):
-        st.cache_data.clear()
+        st.session_state['actualisation'] = request_source_refresh(None if choix == TOUTES_SOURCES else [choix])
         st.rerun()
+    if 'actualisation' in st.session_state:
+        show_refresh_request(*st.session_state.pop('actualisation'))
     
     # Chargement des données
     df = load_real_time_data()
@@ -197,19 +260,19 @@ def main():
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        montant_total = df_filtre['montant_total'].sum()
+        montant_total = df_filtre['montant_total_centimes'].sum()
         st.metric(
             label="💰 Montant Total Engagé",
-            value=f"{montant_total:,.0f} €".replace(",", " "),
+            value=format_euros(montant_total),
             delta=f"{len(df_filtre)} projets"
         )
     
     with col2:
-        montant_paye = df_filtre['montant_paye'].sum()
+        montant_paye = df_filtre['montant_paye_centimes'].sum()
         taux_paiement = (montant_paye / montant_total * 100) if montant_total > 0 else 0
         st.metric(
             label="💳 Montant Déjà Payé",
-            value=f"{montant_paye:,.0f} €".replace(",", " "),
+            value=format_euros(montant_paye),
             delta=f"{taux_paiement:.1f}%"
         )
     
@@ -241,10 +304,10 @@ def main():
     with col1:
         st.markdown('<h3 class="section-header">📈 Répartition par Programme</h3>', unsafe_allow_html=True)
         
-        programme_stats = df_filtre.groupby('programme').agg({
-            'montant_total': 'sum',
+        programme_stats = with_euros(df_filtre.groupby('programme', observed=True).agg({
+            'montant_total_centimes': 'sum',
             'id': 'count'
-        }).reset_index()
+        }).reset_index())
         
         if not programme_stats.empty:
             fig_programmes = px.pie(
@@ -262,10 +325,10 @@ def main():
     with col2:
         st.markdown('<h3 class="section-header">🏗️ Répartition par Secteur</h3>', unsafe_allow_html=True)
         
-        secteur_stats = df_filtre.groupby('secteur').agg({
-            'montant_total': 'sum',
+        secteur_stats = with_euros(df_filtre.groupby('secteur', observed=True).agg({
+            'montant_total_centimes': 'sum',
             'id': 'count'
-        }).reset_index()
+        }).reset_index())
         
         if not secteur_stats.empty:
             secteur_stats = secteur_stats.sort_values('montant_total', ascending=True)
@@ -290,11 +353,11 @@ def main():
     with col1:
         nb_lignes = st.selectbox("Nombre de projets à afficher", [10, 25, 50, 100])
     
-    # Formatage pour l'affichage
-    df_affichage = df_filtre.copy()
-    df_affichage['montant_total'] = df_affichage['montant_total'].apply(lambda x: f"{x:,.0f} €".replace(",", " "))
-    df_affichage['montant_paye'] = df_affichage['montant_paye'].apply(lambda x: f"{x:,.0f} €".replace(",", " "))
-    df_affichage['taux_realisation'] = df_affichage['taux_realisation'].apply(lambda x: f"{x}%")
+    # Formatage pour l'affichage, limité aux lignes affichées
+    df_affichage = df_filtre.head(nb_lignes).copy()
+    df_affichage['montant_total'] = df_affichage['montant_total_centimes'].map(format_euros)
+    df_affichage['montant_paye'] = df_affichage['montant_paye_centimes'].map(format_euros)
+    df_affichage['taux_realisation'] = df_affichage['taux_realisation'].apply(lambda x: f"{x:g}%")
     
     colonnes_a_afficher = ['id', 'programme', 'secteur', 'beneficiaire', 'commune', 
                           'montant_total', 'montant_paye', 'taux_realisation', 'statut', 'source']
@@ -309,7 +372,8 @@ def main():
     st.markdown("---")
     st.markdown("### 📥 Télécharger les données")
     
-    csv = df_filtre.to_csv(index=False, sep=';').encode('utf-8')
+    # Montants exportés en euros, exacts au centime
+    csv = with_euros(df_filtre).to_csv(index=False, sep=';').encode('utf-8')
     st.download_button(
         label="💾 Télécharger les données (CSV)",
         data=csv,
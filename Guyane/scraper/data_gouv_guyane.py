@@ -1,117 +1,175 @@
-import requests
 import pandas as pd
+from functools import partial
 from datetime import datetime
+from utils.http_session import download_to_file
+from utils.resource_reader import resolve_csv_schema, iter_territory_csv_chunks, iter_territory_excel_chunks
+from utils.data_gouv_catalog import crawl_catalog, unique_resources, process_resources, format_stats, resource_format
+from utils.resource_manifest import load_parsed_resource, store_parsed_resource
+from utils.source_registry import source
+from utils.record_ids import frame_ids
 
-def scrape_data_gouv_guyane():
-    """Récupère les données ouvertes sur les fonds européens depuis data.gouv.fr pour la Guyane"""
-    
-    try:
-        # Recherche des jeux de données sur les fonds européens en Guyane
-        search_url = "https://www.data.gouv.fr/api/1/datasets/?q=fonds+européens+guyane"
-        
-        response = requests.get(search_url, timeout=10)
-        response.raise_for_status()
-        
-        datasets = response.json()['data']
-        
-        all_data = []
-        
-        for dataset in datasets[:3]:  # Prendre les 3 premiers jeux de données
-            try:
-                dataset_data = process_data_gouv_dataset(dataset)
-                if dataset_data:
-                    all_data.extend(dataset_data)
-            except Exception as e:
-                continue
-        
-        if not all_data:
-            return generate_data_gouv_fallback()
-        
-        return all_data
-        
-    except Exception as e:
-        print(f"Erreur scraping data.gouv.fr: {e}")
-        return generate_data_gouv_fallback()
+# Identification du territoire dans les fichiers nationaux (codes INSEE du département et de la région, libellé)
+TERRITOIRE = {'slug': 'guyane', 'codes': ['973'], 'codes_region': ['03'], 'noms': ['guyane']}
 
-def process_data_gouv_dataset(dataset):
-    """Traite un jeu de données data.gouv.fr"""
+def scrape_data_gouv_guyane(force_refresh=False):
+    """Récupère les données ouvertes sur les fonds européens depuis data.gouv.fr pour la Guyane
+
+    Avec force_refresh=True, les ressources sont retéléchargées même si le
+    catalogue les indique inchangées. Générateur : chaque ressource est
+    produite dès qu'elle est traitée, en un DataFrame (lot de lignes en
+    colonnes), sans passer par une liste de dicts. Lève une exception si le
+    catalogue est injoignable ou n'a aucune ressource exploitable.
+    """
     
-    # Chercher les ressources CSV
-    resources = dataset.get('resources', [])
-    csv_resources = [r for r in resources if r.get('format') in ['csv', 'xls', 'xlsx']]
+    # Recherche des jeux de données sur les fonds européens en Guyane
+    search_url = "https://www.data.gouv.fr/api/1/datasets/?q=fonds+européens+guyane"
     
-    if not csv_resources:
-        return None
+    # Parcours complet de la pagination, puis traitement parallèle des ressources uniques
+    datasets, stats = crawl_catalog(search_url)
+    resources = unique_resources(datasets)
     
-    data = []
+    frames = process_resources(
+        resources,
+        lambda resource, dataset: process_data_gouv_resource(resource, dataset, force_refresh),
+        stats
+    )
     
-    for resource in csv_resources[:2]:  # Prendre les 2 premières ressources
-        try:
-            resource_url = resource['url']
-            
-            if resource_url.endswith('.csv'):
-                df = pd.read_csv(resource_url, sep=';', encoding='utf-8', low_memory=False)
-            else:
-                # Pour les fichiers Excel
-                df = pd.read_excel(resource_url)
-            
-            # Adapter selon la structure du fichier
-            processed_data = adapt_data_gouv_structure(df, dataset['title'])
-            if processed_data:
-                data.extend(processed_data)
-                
-        except Exception as e:
-            print(f"Erreur traitement ressource {resource_url}: {e}")
-            continue
+    projets = 0
+    for df in frames:
+        if not df.empty:
+            projets += len(df)
+            yield df
     
-    return data
+    print(f"data.gouv.fr: {format_stats(stats)}")
+    
+    # Aucune ressource exploitable : la source est en échec, son dernier résultat est conservé
+    if not projets:
+        raise ValueError("aucune ressource exploitable dans le catalogue")
 
-def adapt_data_gouv_structure(df, dataset_title):
-    """Adapte la structure des données selon le format du fichier"""
+def process_data_gouv_resource(resource, dataset, force_refresh=False):
+    """Traite une ressource, ou relit sa sortie en cache si le catalogue l'indique inchangée"""
     
-    data = []
+    # Ressource inchangée d'après le catalogue (checksum, last_modified) : relire sa sortie traitée
+    if not force_refresh:
+        found, cached_df = load_parsed_resource(TERRITOIRE['slug'], resource, dataset['title'])
+        if found:
+            return cached_df
+    
+    processed_df = parse_data_gouv_resource(resource, dataset)
+    store_parsed_resource(TERRITOIRE['slug'], resource, dataset['title'], processed_df)
+    
+    return processed_df
+
+def parse_data_gouv_resource(resource, dataset):
+    """Télécharge et adapte une ressource CSV ou Excel d'un jeu de données"""
+    
+    resource_url = resource['url']
+    
+    # Lecture en flux par morceaux : mémoire bornée quelle que soit la taille du fichier
+    resource_path = download_to_file(resource_url)
+    
+    col_mapping = None
     
-    # Chercher les colonnes pertinentes
-    colonnes = df.columns.tolist()
+    # Format déclaré dans le catalogue : les URL stables /fr/datasets/r/<uuid> n'ont pas d'extension
+    if resource_format(resource) == 'csv':
+        # Dialecte, encodage et rôles des colonnes détectés sur les premiers Ko (ou déjà connus)
+        schema = resolve_csv_schema(resource_path, detect_column_mapping, resource_url)
+        if schema is None:
+            return None
+        col_mapping = schema['roles']
+        chunks = iter_territory_csv_chunks(resource_path, schema, TERRITOIRE)
+    else:
+        # Pour les fichiers Excel : en-tête repéré d'abord, puis seules les colonnes utiles
+        chunks = iter_territory_excel_chunks(resource_path, mapped_columns, TERRITOIRE)
     
-    # Mapping des colonnes potentielles
-    col_mapping = {
+    # Empreintes déjà vues dans ce fichier : les lignes identiques reçoivent des identifiants distincts
+    vus = {}
+    frames = []
+    for chunk in chunks:
+        # Adapter selon la structure du fichier
+        processed_df = adapt_data_gouv_structure(chunk, dataset['title'], col_mapping, resource_url, vus)
+        if not processed_df.empty:
+            frames.append(processed_df)
+    
+    if not frames:
+        return None
+    
+    return pd.concat(frames, ignore_index=True)
+
+def detect_column_mapping(colonnes):
+    """Repère les colonnes utiles d'un fichier data.gouv.fr d'après leur nom"""
+    
+    colonnes = [str(c) for c in colonnes]
+    
+    return {
         'programme': next((c for c in colonnes if 'programme' in c.lower()), None),
         'montant': next((c for c in colonnes if any(word in c.lower() for word in ['montant', 'budget', 'financement'])), None),
         'beneficiaire': next((c for c in colonnes if 'beneficiaire' in c.lower()), None),
         'secteur': next((c for c in colonnes if any(word in c.lower() for word in ['secteur', 'domaine', 'theme'])), None),
     }
+
+def mapped_columns(colonnes):
+    """Colonnes d'un en-tête retenues par le mapping (pour ne lire qu'elles)"""
+    return [c for c in detect_column_mapping(colonnes).values() if c]
+
+def adapt_data_gouv_structure(df, dataset_title, col_mapping=None, resource_url=None, vus=None):
+    """Adapte la structure des données selon le format du fichier (traitement par colonnes)
+
+    `col_mapping` peut venir du registre des schémas ; sinon les rôles des
+    colonnes sont déduits de leur nom. Les identifiants portent sur l'URL de
+    la ressource, les colonnes du mapping de chaque ligne et son rang parmi
+    les lignes identiques, `vus` étant partagé entre les morceaux du fichier.
+    """
     
-    for _, row in df.iterrows():
-        try:
-            programme = str(row[col_mapping['programme']]) if col_mapping['programme'] else 'FEDER'
-            montant_str = str(row[col_mapping['montant']]) if col_mapping['montant'] else '0'
-            
-            # Nettoyer le montant
-            montant = float(montant_str.replace('€', '').replace(',', '.').strip()) if montant_str.replace('.', '').isdigit() else 100000
-            
-            if montant <= 0:
-                continue
-                
-            data.append({
-                'id': f"DG_{hash(str(row)) % 10000:04d}",
-                'titre': f"Projet {dataset_title}",
-                'programme': programme,
-                'secteur': str(row[col_mapping['secteur']]) if col_mapping['secteur'] else 'Développement régional',
-                'montant_total': montant,
-                'montant_paye': montant * 0.8,
-                'statut': 'En cours',
-                'taux_realisation': 80,
-                'beneficiaire': str(row[col_mapping['beneficiaire']]) if col_mapping['beneficiaire'] else 'Bénéficiaire',
-                'date_debut': '2023-01-01',
-                'date_fin_prevue': '2025-12-31',
-                'commune': 'Guyane',
-                'source': f"data.gouv.fr - {dataset_title}"
-            })
-        except Exception as e:
-            continue
+    # Les colonnes sont recherchées par leur nom textuel
+    df = df.rename(columns=str)
+    if col_mapping is None:
+        col_mapping = detect_column_mapping(df.columns)
     
-    return data
+    # Montants : seules les valeurs purement numériques sont lues, les autres valent 100 000 €
+    if col_mapping['montant']:
+        montant_str = df[col_mapping['montant']].astype(str)
+        est_numerique = montant_str.str.replace('.', '', regex=False).str.isdigit().fillna(False).astype(bool)
+        montant = pd.Series(100000.0, index=df.index)
+        montant[est_numerique] = pd.to_numeric(montant_str[est_numerique], errors='coerce')
+    else:
+        montant = pd.Series(0.0, index=df.index)
+    
+    # Montants nuls, négatifs ou illisibles écartés
+    garder = (montant > 0).to_numpy()
+    df = df.loc[garder]
+    montant = montant[garder].astype('float64').reset_index(drop=True)
+    
+    # Clé des identifiants : colonnes du mapping, telles que lues dans le fichier
+    cles = list(dict.fromkeys(c for c in col_mapping.values() if c))
+    
+    n = len(df)
+    
+    result = pd.DataFrame({
+        'id': frame_ids('DG', resource_url or f"data.gouv.fr - {dataset_title}", df[cles], vus),
+        'titre': f"Projet {dataset_title}",
+        'programme': _text_column(df, col_mapping['programme'], 'FEDER'),
+        'secteur': _text_column(df, col_mapping['secteur'], 'Développement régional'),
+        'montant_total': montant,
+        'montant_paye': montant * 0.8,
+        'statut': 'En cours',
+        'taux_realisation': 80,
+        'beneficiaire': _text_column(df, col_mapping['beneficiaire'], 'Bénéficiaire'),
+        'date_debut': '2023-01-01',
+        'date_fin_prevue': '2025-12-31',
+        'commune': 'Guyane',
+        'source': f"data.gouv.fr - {dataset_title}"
+    }, index=pd.RangeIndex(n))
+    
+    return result
+
+def _text_column(df, colonne, defaut):
+    """Colonne texte issue du fichier, ou valeur par défaut si absente ou vide"""
+    if not colonne:
+        return pd.Series(defaut, index=pd.RangeIndex(len(df)), dtype=object)
+    
+    values = df[colonne].astype(str).reset_index(drop=True)
+    return values.where(df[colonne].notna().to_numpy(), defaut)
 
 def generate_data_gouv_fallback():
     """Génère des données de fallback pour data.gouv.fr pour la Guyane"""
@@ -142,4 +200,11 @@ def generate_data_gouv_fallback():
             'source': 'data.gouv.fr (données de référence Guyane)'
         })
     
-    return data
\ No newline at end of file
+    return data
+
+# Déclaration pour le registre des sources. Catalogue complet et fichiers volumineux : mis à jour au plus une fois
+# par jour, avec 30 minutes pour parcourir le catalogue et télécharger les fichiers nationaux.
+# Actualisation forcée : toutes les ressources sont retéléchargées, même inchangées d'après le catalogue
+SOURCE = source("data.gouv.fr", scrape_data_gouv_guyane, ttl=24 * 3600, cout=5, priorite=3,
+                secours=generate_data_gouv_fallback, delai=30 * 60,
+                forcee=partial(scrape_data_gouv_guyane, force_refresh=True))
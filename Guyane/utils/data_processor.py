@@ -1,69 +1,344 @@
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
+# Version du schéma produit : un snapshot publié avec une autre version est à reconstruire
+SCHEMA_VERSION = 2
+
+# Valeurs normalisées des champs à catégories fixes
+PROGRAMMES = pd.CategoricalDtype(['FEDER', 'FSE', 'FEADER', 'INTERREG'])
+STATUTS = pd.CategoricalDtype(['En cours', 'En finalisation', 'Terminé'])
+
+# Champs texte répétés d'une ligne à l'autre : catégories (un code entier par ligne au lieu d'un objet str)
+CATEGORY_COLUMNS = ['titre', 'secteur', 'commune', 'source', 'beneficiaire']
+
+# Montants en euros reçus des sources -> colonnes en centimes entiers (int64) : sommes exactes et reproductibles
+MONEY_COLUMNS = {
+    'montant_total': 'montant_total_centimes',
+    'montant_paye': 'montant_paye_centimes',
+}
+
+# Autres champs numériques, en largeur fixe
+NUMERIC_DTYPES = {
+    'taux_realisation': 'float32',
+}
+DATE_COLUMNS = ['date_debut', 'date_fin_prevue']
+
+# Enregistrements (dicts) gardés au plus en attente avant leur passage en colonnes
+BATCH_SIZE = 10_000
+
+# Bornes des montants acceptés (en centimes, exclues) : au moins 1000€, moins de 100 millions
+MIN_MONTANT_CENTIMES = 1000 * 100
+MAX_MONTANT_CENTIMES = 100000000 * 100
+
+# Standardisation des programmes (valeur inconnue : FEDER)
+PROGRAMME_MAPPING = {
+    'FEDER': 'FEDER',
+    'FSE': 'FSE',
+    'FEADER': 'FEADER',
+    'FSE+': 'FSE',
+    'INTERREG': 'INTERREG',
+    'ERDF': 'FEDER',
+    'ESF': 'FSE'
+}
+
+# Nettoyage des statuts, comparés en minuscules (valeur inconnue : En cours)
+STATUT_MAPPING = {
+    'terminé': 'Terminé',
+    'en cours': 'En cours',
+    'finalisation': 'En finalisation',
+    'en finalisation': 'En finalisation',
+    'completed': 'Terminé',
+    'in progress': 'En cours'
+}
+
 def process_funds_data(raw_data):
-    """Traite et uniformise les données brutes des différentes sources"""
+    """Traite et uniformise les données brutes des différentes sources
+
+    `raw_data` est un itérable d'enregistrements (dicts) ou de lots
+    (listes de dicts, DataFrames), consommé au fil de l'eau par
+    collect_records : un générateur n'est jamais matérialisé en liste.
+
+    Le DataFrame retourné est typé : programme, secteur, statut, commune,
+    source et bénéficiaire en catégories, montants en centimes entiers
+    (montant_total_centimes, montant_paye_centimes, int64), taux en float32,
+    dates en datetime64 (NaT si illisibles). Les montants ne repassent en
+    euros qu'à l'affichage et à l'export (format_euros, with_euros).
+
+    Le rapport de validation (lignes écartées et valeurs corrigées, par
+    règle et par source) est joint dans df.attrs['validation'].
+    """
     
-    if not raw_data:
+    # Conversion en DataFrame, lot par lot
+    df = collect_records(raw_data)
+    
+    if df.empty:
         return pd.DataFrame()
     
-    # Conversion en DataFrame
-    df = pd.DataFrame(raw_data)
+    # Nettoyage, uniformisation et validation en une seule passe
+    df, rapport = normalize_data(df)
     
-    # Nettoyage et uniformisation
-    df = clean_data(df)
+    df.attrs['schema'] = SCHEMA_VERSION
+    df.attrs['validation'] = rapport
+    return df
+
+def collect_records(records, batch_size=BATCH_SIZE):
+    """Consomme un flux d'enregistrements ou de lots et le range en colonnes
+
+    Chaque élément de `records` est un enregistrement (dict), un lot
+    d'enregistrements (liste de dicts) ou un DataFrame. Les dicts ne sont
+    gardés que par paquets de `batch_size`, aussitôt convertis en
+    colonnes ; les DataFrames sont repris tels quels. Retourne un seul
+    DataFrame brut (vide si le flux l'est).
+
+    Lève TypeError si `records` est lui-même un DataFrame, un dict ou du
+    texte, ou si un élément est du texte : les parcourir donnerait des noms
+    de colonne ou des caractères, pas des enregistrements.
+    """
+    if isinstance(records, (pd.DataFrame, dict, str, bytes)):
+        raise TypeError(f"flux d'enregistrements attendu, {type(records).__name__} reçu (à envelopper dans une liste)")
     
-    # Validation des données
-    df = validate_data(df)
+    morceaux = []
+    en_attente = []
     
-    return df
+    for element in records:
+        if isinstance(element, (str, bytes)):
+            raise TypeError(f"enregistrement, lot ou DataFrame attendu, {type(element).__name__} reçu")
+        if isinstance(element, pd.DataFrame):
+            _flush_records(en_attente, morceaux)
+            if not element.empty:
+                morceaux.append(element)
+            continue
+        
+        if isinstance(element, dict):
+            en_attente.append(element)
+        else:
+            en_attente.extend(element)
+        if len(en_attente) >= batch_size:
+            _flush_records(en_attente, morceaux)
+    
+    _flush_records(en_attente, morceaux)
+    
+    if not morceaux:
+        return pd.DataFrame()
+    if len(morceaux) == 1:
+        return morceaux[0].reset_index(drop=True)
+    return pd.concat(morceaux, ignore_index=True)
 
-def clean_data(df):
-    """Nettoie et uniformise les données"""
-    
-    # Standardisation des programmes
-    programme_mapping = {
-        'FEDER': 'FEDER',
-        'FSE': 'FSE', 
-        'FEADER': 'FEADER',
-        'FSE+': 'FSE',
-        'INTERREG': 'INTERREG',
-        'ERDF': 'FEDER',
-        'ESF': 'FSE'
-    }
+def normalize_data(df, regles=None):
+    """Nettoie, uniformise et valide les données en une seule passe sur des tableaux NumPy
+
+    Chaque colonne est lue une fois : montants et taux sont convertis sur
+    le tableau entier, programmes, statuts et autres catégories ne sont
+    traités qu'une fois par valeur distincte. Chaque règle de `regles`
+    (RULES par défaut) devient un masque booléen sur toute la colonne
+    qu'elle contrôle ; les rejets sont combinés en un seul masque de
+    validité, puis les corrections sont évaluées sur les lignes gardées.
+    Le DataFrame résultat est construit une fois, directement à partir des
+    tableaux filtrés (pas de copie intermédiaire ni d'écriture dans une vue).
+
+    Retourne (DataFrame, rapport de validation), voir _report.
+    """
     
-    df['programme'] = df['programme'].map(programme_mapping).fillna('FEDER')
+    regles = RULES if regles is None else regles
     
-    # Nettoyage des montants
-    df['montant_total'] = pd.to_numeric(df['montant_total'], errors='coerce').fillna(0)
-    df['montant_paye'] = pd.to_numeric(df['montant_paye'], errors='coerce').fillna(0)
-    df['taux_realisation'] = pd.to_numeric(df['taux_realisation'], errors='coerce').fillna(0)
+    # Nettoyage des montants : conversion exacte en centimes, une seule fois, à l'entrée
+    valeurs = {colonne: to_cents(df[colonne]) for colonne in MONEY_COLUMNS}
+    valeurs['taux_realisation'] = np.nan_to_num(
+        pd.to_numeric(df['taux_realisation'], errors='coerce').to_numpy(dtype='float64'), nan=0.0)
     
-    # S'assurer que le montant payé ne dépasse pas le montant total
-    df['montant_paye'] = df[['montant_paye', 'montant_total']].min(axis=1)
+    # Sources : codes partagés entre les comptages par source et la colonne catégorielle
+    if 'source' in df.columns:
+        codes_sources, noms_sources = pd.factorize(df['source'], sort=True)
+    else:
+        codes_sources, noms_sources = np.full(len(df), -1, dtype='intp'), pd.Index([])
     
-    # Nettoyage des statuts
-    statut_mapping = {
-        'terminé': 'Terminé',
-        'en cours': 'En cours',
-        'finalisation': 'En finalisation',
-        'en finalisation': 'En finalisation',
-        'completed': 'Terminé',
-        'in progress': 'En cours'
-    }
+    # Règles de rejet : un seul masque des lignes gardées
+    comptes = {}
+    valide = np.ones(len(df), dtype=bool)
+    for regle in regles:
+        if regle['type'] == 'rejet' and regle['colonne'] in valeurs:
+            masque = regle['condition'](valeurs[regle['colonne']])
+            comptes[regle['nom']] = _count(masque, codes_sources, noms_sources)
+            valide &= ~masque
+    
+    valeurs = {colonne: tableau[valide] for colonne, tableau in valeurs.items()}
+    codes_sources = codes_sources[valide]
+    
+    # Règles de correction, évaluées sur les lignes gardées uniquement
+    categories = {}
+    for regle in regles:
+        if regle['type'] == 'correspondance' and regle['colonne'] in df.columns:
+            categories[regle['colonne']], masque = _map_to_categories(df[regle['colonne']], valide, regle)
+            comptes[regle['nom']] = _count(masque, codes_sources, noms_sources)
+        elif regle['type'] == 'ecretage' and regle['colonne'] in valeurs:
+            valeurs[regle['colonne']], masque = _clip(valeurs, regle)
+            comptes[regle['nom']] = _count(masque, codes_sources, noms_sources)
     
-    df['statut'] = df['statut'].str.lower().map(statut_mapping).fillna('En cours')
+    colonnes = {}
+    for colonne in df.columns:
+        if colonne in MONEY_COLUMNS:
+            colonnes[MONEY_COLUMNS[colonne]] = valeurs[colonne]
+        elif colonne in NUMERIC_DTYPES:
+            colonnes[colonne] = valeurs[colonne].astype(NUMERIC_DTYPES[colonne])
+        elif colonne in categories:
+            colonnes[colonne] = categories[colonne]
+        elif colonne == 'source':
+            colonnes[colonne] = pd.Categorical.from_codes(codes_sources, categories=noms_sources)
+        elif colonne in CATEGORY_COLUMNS:
+            colonnes[colonne] = _categories(df[colonne], valide)
+        elif colonne in DATE_COLUMNS:
+            colonnes[colonne] = _dates(df[colonne], valide)
+        else:
+            colonnes[colonne] = df[colonne].array[valide]
     
+    propre = pd.DataFrame(colonnes, index=pd.RangeIndex(int(valide.sum())))
+    return propre, _report(regles, comptes, len(df), len(propre))
+
+def reject_if(nom, colonne, condition, description):
+    """Règle de rejet : les lignes où condition(colonne) est vrai sont écartées
+
+    `condition` reçoit la colonne entière, déjà convertie (montants en
+    centimes int64, taux en float64), et retourne un masque booléen.
+    """
+    return {'nom': nom, 'type': 'rejet', 'action': 'rejet', 'colonne': colonne,
+            'condition': condition, 'description': description}
+
+def coerce_unknown(nom, colonne, correspondance, dtype, defaut, description, normaliser=None):
+    """Règle de correction : valeur absente de `correspondance` (ou manquante) -> `defaut`
+
+    Les valeurs connues sont uniformisées par `correspondance` (après
+    `normaliser`, ex. str.lower) ; seules les valeurs inconnues sont comptées.
+    """
+    return {'nom': nom, 'type': 'correspondance', 'action': 'correction', 'colonne': colonne,
+            'correspondance': correspondance, 'dtype': dtype, 'defaut': defaut,
+            'normaliser': normaliser, 'description': description}
+
+def clip_to(nom, colonne, minimum, maximum, description):
+    """Règle de correction : valeurs ramenées entre `minimum` et `maximum`
+
+    Une borne peut être un nombre, le nom d'une autre colonne numérique
+    (comparaison ligne à ligne) ou None (pas de borne).
+    """
+    return {'nom': nom, 'type': 'ecretage', 'action': 'correction', 'colonne': colonne,
+            'minimum': minimum, 'maximum': maximum, 'description': description}
+
+# Règles de validation, appliquées dans l'ordre par normalize_data
+RULES = [
+    reject_if('montant_minimum', 'montant_total', lambda centimes: centimes <= MIN_MONTANT_CENTIMES,
+              "Montant total de 1 000 € ou moins : projet écarté"),
+    reject_if('montant_maximum', 'montant_total', lambda centimes: centimes >= MAX_MONTANT_CENTIMES,
+              "Montant total de 100 M€ ou plus : projet écarté"),
+    coerce_unknown('programme_inconnu', 'programme', PROGRAMME_MAPPING, PROGRAMMES, 'FEDER',
+                   "Programme non reconnu : ramené à FEDER"),
+    coerce_unknown('statut_inconnu', 'statut', STATUT_MAPPING, STATUTS, 'En cours',
+                   "Statut non reconnu : ramené à En cours", str.lower),
+    clip_to('montant_paye_plafonne', 'montant_paye', None, 'montant_total',
+            "Montant payé supérieur au montant total : plafonné"),
+    clip_to('taux_borne', 'taux_realisation', 0, 100,
+            "Taux de réalisation hors de 0-100 % : borné"),
+]
+
+def to_cents(values):
+    """Montants en euros (nombres ou texte numérique) -> centimes int64, au centime le plus proche
+
+    L'arrondi se fait au demi-centime supérieur, après élimination des
+    erreurs de représentation binaire (0.285 € -> 29 centimes, pas 28).
+    Les valeurs illisibles valent 0.
+    """
+    centimes = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype='float64') * 100
+    np.nan_to_num(centimes, copy=False, nan=0.0)
+    np.round(centimes, 6, out=centimes)
+    signe = np.sign(centimes)
+    np.abs(centimes, out=centimes)
+    centimes += 0.5
+    np.floor(centimes, out=centimes)
+    centimes *= signe
+    return centimes.astype('int64')
+
+def format_euros(centimes):
+    """Centimes entiers -> texte arrondi à l'euro ('1 234 567 €')"""
+    euros = (abs(int(centimes)) + 50) // 100
+    signe = '-' if centimes < 0 and euros else ''
+    return f"{signe}{euros:,} €".replace(",", " ")
+
+def with_euros(df):
+    """Copie de df où les colonnes en centimes redeviennent des montants en euros (export CSV, graphiques)
+
+    Les montants sont écrits avec au plus deux décimales exactes (123456 -> 1234.56).
+    """
+    df = df.copy()
+    for colonne, colonne_centimes in MONEY_COLUMNS.items():
+        if colonne_centimes in df.columns:
+            position = df.columns.get_loc(colonne_centimes)
+            df.insert(position, colonne, df.pop(colonne_centimes) / 100)
     return df
 
-def validate_data(df):
-    """Valide la cohérence des données"""
-    
-    # Filtrer les projets avec des montants aberrants
-    df = df[df['montant_total'] > 1000]  # Au moins 1000€
-    df = df[df['montant_total'] < 100000000]  # Moins de 100 millions
+def _flush_records(en_attente, morceaux):
+    # Paquet de dicts -> DataFrame ; la liste est vidée sur place pour le paquet suivant
+    if en_attente:
+        morceaux.append(pd.DataFrame(en_attente))
+        en_attente.clear()
+
+def _map_to_categories(series, valide, regle):
+    # La correspondance n'est calculée qu'une fois par valeur distincte, puis appliquée aux codes
+    codes, uniques = pd.factorize(series)
+    normaliser = regle['normaliser']
+    cibles = []
+    for valeur in uniques:
+        cle = valeur
+        if normaliser is not None:
+            cle = normaliser(valeur) if isinstance(valeur, str) else None
+        cibles.append(regle['correspondance'].get(cle))
+    cibles.append(None)  # code -1 : valeur manquante
     
-    # S'assurer que le taux de réalisation est entre 0 et 100
-    df['taux_realisation'] = df['taux_realisation'].clip(0, 100)
+    inconnues = np.array([cible is None for cible in cibles])
+    cibles = [regle['defaut'] if cible is None else cible for cible in cibles]
+    codes_cibles = regle['dtype'].categories.get_indexer(cibles)
     
-    return df
\ No newline at end of file
+    codes = codes[valide]
+    return pd.Categorical.from_codes(codes_cibles[codes], dtype=regle['dtype']), inconnues[codes]
+
+def _clip(valeurs, regle):
+    # Bornes numériques ou colonne voisine (ex. montant payé plafonné au montant total)
+    tableau = valeurs[regle['colonne']]
+    masque = np.zeros(len(tableau), dtype=bool)
+    for borne, fonction, hors in ((regle['minimum'], np.maximum, np.less), (regle['maximum'], np.minimum, np.greater)):
+        if borne is None:
+            continue
+        borne = valeurs[borne] if isinstance(borne, str) else borne
+        masque |= hors(tableau, borne)
+        tableau = fonction(tableau, borne)
+    return tableau, masque
+
+def _count(masque, codes_sources, noms_sources):
+    # Lignes du masque par source, en un seul bincount (code -1 : source non renseignée)
+    par_code = np.bincount(codes_sources[masque] + 1, minlength=len(noms_sources) + 1)
+    par_source = {nom: int(n) for nom, n in zip(noms_sources, par_code[1:]) if n}
+    if par_code[0]:
+        par_source['Non renseignée'] = int(par_code[0])
+    return int(par_code.sum()), par_source
+
+def _report(regles, comptes, lignes, gardees):
+    # Rapport compact (entiers et textes) : il voyage dans df.attrs et dans les snapshots
+    return {
+        'lignes': lignes,
+        'rejetees': lignes - gardees,
+        'regles': [
+            {'nom': regle['nom'], 'action': regle['action'], 'description': regle['description'],
+             'lignes': comptes[regle['nom']][0], 'par_source': comptes[regle['nom']][1]}
+            for regle in regles if regle['nom'] in comptes
+        ],
+    }
+
+def _categories(series, valide):
+    # Catégories triées, comme astype('category') ; les valeurs manquantes gardent le code -1
+    codes, uniques = pd.factorize(series, sort=True)
+    return pd.Categorical.from_codes(codes[valide], categories=uniques)
+
+def _dates(series, valide):
+    # Chaque date distincte n'est lue qu'une fois ; NaT si illisible ou manquante
+    codes, uniques = pd.factorize(series)
+    dates = pd.to_datetime(pd.Series(uniques, dtype=object), errors='coerce', format='%Y-%m-%d').to_numpy()
+    dates = np.append(dates, np.array(['NaT'], dtype=dates.dtype))
+    return dates[codes[valide]]
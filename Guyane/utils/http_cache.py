@@ -0,0 +1,133 @@
+import os
+import json
+import hashlib
+import time
+import threading
+import requests
+
+# Répertoire partagé par tous les territoires d'un même hôte
+CACHE_DIR = os.environ.get(
+    'FONDS_EUROPEENS_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'fonds_europeens')
+)
+
+HTTP_CACHE_DIR = os.path.join(CACHE_DIR, 'http')
+
+def _entry_paths(url):
+    """Chemins du corps et des métadonnées en cache pour une URL"""
+    key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+    base = os.path.join(HTTP_CACHE_DIR, key[:2], key)
+    return base + '.body', base + '.json'
+
+def load_entry(url):
+    """Charge les métadonnées en cache d'une URL, ou None"""
+    _, meta_path = _entry_paths(url)
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def conditional_headers(entry):
+    """Construit les en-têtes If-None-Match / If-Modified-Since d'une entrée"""
+    headers = {}
+    if not entry:
+        return headers
+
+    if entry.get('etag'):
+        headers['If-None-Match'] = entry['etag']
+    if entry.get('last_modified'):
+        headers['If-Modified-Since'] = entry['last_modified']
+
+    return headers
+
+def cached_body_path(url):
+    """Chemin du corps en cache d'une URL"""
+    return _entry_paths(url)[0]
+
+def store_response(url, response):
+    """Enregistre une réponse 200 possédant un validateur (ETag ou Last-Modified)"""
+    meta = _response_meta(url, response)
+
+    if response.status_code != 200 or not (meta['etag'] or meta['last_modified']):
+        return
+
+    body_path, meta_path = _entry_paths(url)
+    os.makedirs(os.path.dirname(body_path), exist_ok=True)
+
+    # Écriture atomique : le corps d'abord, puis les métadonnées qui le référencent
+    _atomic_write(body_path, response.content)
+    _atomic_write(meta_path, json.dumps(meta).encode('utf-8'))
+
+def store_stream(url, response, chunk_size=1 << 20, on_chunk=None):
+    """Écrit le corps d'une réponse en flux dans le cache, sans le charger en mémoire
+
+    Retourne le chemin du fichier obtenu. Le corps est conservé même sans
+    validateur, car il sert de fichier de travail aux lectures par morceaux.
+    """
+    body_path, meta_path = _entry_paths(url)
+    os.makedirs(os.path.dirname(body_path), exist_ok=True)
+
+    tmp_path = f"{body_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            f.write(chunk)
+            if on_chunk:
+                on_chunk(len(chunk))
+    os.replace(tmp_path, body_path)
+
+    _atomic_write(meta_path, json.dumps(_response_meta(url, response)).encode('utf-8'))
+
+    return body_path
+
+def touch_entry(url, entry):
+    """Marque une entrée comme revalidée (après un 304)"""
+    _, meta_path = _entry_paths(url)
+    entry['stored_at'] = time.time()
+    try:
+        _atomic_write(meta_path, json.dumps(entry).encode('utf-8'))
+    except OSError:
+        pass
+
+def _response_meta(url, response):
+    """Métadonnées conservées pour une réponse"""
+    return {
+        'url': url,
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'content_type': response.headers.get('Content-Type'),
+        'encoding': response.encoding,
+        'stored_at': time.time()
+    }
+
+def cached_response(url, entry):
+    """Reconstruit une réponse 200 à partir du corps en cache (après un 304)"""
+    try:
+        with open(cached_body_path(url), 'rb') as f:
+            content = f.read()
+    except OSError:
+        return None
+
+    touch_entry(url, entry)
+
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = content
+    response.encoding = entry.get('encoding')
+    if entry.get('content_type'):
+        response.headers['Content-Type'] = entry['content_type']
+    if entry.get('etag'):
+        response.headers['ETag'] = entry['etag']
+    if entry.get('last_modified'):
+        response.headers['Last-Modified'] = entry['last_modified']
+    response.headers['X-Cache'] = 'revalidated'
+
+    return response
+
+def _atomic_write(path, data):
+    """Écrit un fichier via un fichier temporaire puis un renommage"""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,249 @@
+import os
+import json
+import time
+import pickle
+import threading
+from utils.http_cache import CACHE_DIR
+from utils.file_lock import file_lock, LockTimeout
+
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, 'snapshots')
+
+# Au-delà de cet âge (en secondes), le snapshot est encore servi mais rafraîchi en arrière-plan
+MAX_AGE = 3600
+
+# Après un rafraîchissement raté, délai avant une nouvelle tentative automatique
+RETRY_DELAY = 300
+
+# Nombre de versions publiées conservées sur disque par territoire
+KEEP_VERSIONS = 5
+
+# Attente maximum d'une construction du même snapshot déjà en cours dans un autre processus (en secondes)
+LOCK_TIMEOUT = 600
+
+_snapshots = {}
+_refreshing = {}
+_rerun = set()
+_lock = threading.Lock()
+
+def get_snapshot(key, builder=None, max_age=MAX_AGE):
+    """Retourne tout de suite le dernier snapshot publié, ou None
+
+    Sans `builder`, lecture seule : les snapshots sont publiés par refresh.py.
+    Avec `builder` (rafraîchissement intégré au tableau de bord), un snapshot
+    absent ou plus vieux que `max_age` est reconstruit par un seul fil en
+    arrière-plan (stale-while-revalidate) ; l'appelant n'attend jamais les
+    sources. Un snapshot est un dict {'version', 'donnees', 'sources', 'horodatage'}.
+    """
+    snapshot = current_snapshot(key)
+
+    if builder is not None and (snapshot is None or time.time() - snapshot['horodatage'] > max_age):
+        refresh_snapshot(key, builder)
+
+    return snapshot
+
+def refresh_snapshot(key, builder, force=False):
+    """Lance la reconstruction d'un snapshot en arrière-plan, sauf si elle est déjà en cours
+
+    Sans `force`, aucune tentative n'est relancée moins de RETRY_DELAY secondes après un échec.
+    Avec `force`, une demande arrivée pendant une reconstruction en provoque
+    une seule autre à la fin de celle-ci (les sources invalidées entre-temps
+    seraient sinon ignorées), quel que soit le nombre de demandes.
+    """
+    with _lock:
+        if key in _refreshing:
+            if force:
+                _rerun.add(key)
+            return
+
+        failure = last_failure(key)
+        if not force and failure and time.time() - failure['horodatage'] < RETRY_DELAY:
+            return
+
+        thread = threading.Thread(target=_rebuild, args=(key, builder), name=f"snapshot-{key}", daemon=True)
+        _refreshing[key] = thread
+        thread.start()
+
+def build_snapshot(key, builder):
+    """Construit et publie un snapshot de façon synchrone
+
+    `builder()` interroge les sources et retourne (donnees, sources) ; donnees
+    vaut None quand aucune donnée réelle n'a pu être récupérée, et le snapshot
+    publié précédemment reste alors en place. L'échec est enregistré à côté
+    des snapshots pour que le tableau de bord puisse l'afficher.
+    Les constructions d'un même territoire sont sérialisées entre processus
+    (refresh.py, instances Streamlit) : une construction attend la fin de
+    celle en cours, dont les sources fraîchement interrogées sont reprises
+    du cache. Retourne (snapshot ou None, erreur ou None).
+    """
+    try:
+        with file_lock(key, 'snapshot', timeout=LOCK_TIMEOUT):
+            donnees, sources = builder()
+            if donnees is None or len(donnees) == 0:
+                erreur = _sources_error(sources)
+            else:
+                snapshot = publish_snapshot(key, donnees, sources)
+                _clear_failure(key)
+                return snapshot, None
+    except LockTimeout as e:
+        # Pas un échec des sources : la construction en cours ailleurs publiera son snapshot
+        return None, str(e)
+    except OSError as e:
+        erreur = f"publication impossible: {e}"
+    except Exception as e:
+        erreur = str(e)
+
+    _record_failure(key, erreur)
+    return None, erreur
+
+def publish_snapshot(key, donnees, sources):
+    """Publie une nouvelle version du snapshot d'un territoire
+
+    La version est d'abord écrite dans son propre fichier, puis le pointeur
+    current.json est remplacé atomiquement : un lecteur voit toujours une
+    version complète. Seules les KEEP_VERSIONS dernières versions sont gardées.
+    """
+    horodatage = time.time()
+    version = time.strftime('%Y%m%dT%H%M%S', time.gmtime(horodatage)) + f"-{os.getpid()}"
+    snapshot = {
+        'version': version,
+        'donnees': donnees,
+        'sources': sources,
+        'horodatage': horodatage
+    }
+
+    directory = _snapshot_dir(key)
+    os.makedirs(directory, exist_ok=True)
+    _atomic_write(os.path.join(directory, f"{version}.pkl"), pickle.dumps(snapshot))
+    _atomic_write(
+        os.path.join(directory, 'current.json'),
+        json.dumps({'version': version, 'horodatage': horodatage}).encode('utf-8')
+    )
+
+    _snapshots[key] = snapshot
+    _prune_versions(directory, version)
+    return snapshot
+
+def current_snapshot(key):
+    """Dernier snapshot publié ; le fichier n'est relu que si la version publiée a changé"""
+    cached = _snapshots.get(key)
+    pointer = _read_pointer(key)
+    if pointer is None or (cached is not None and cached['version'] == pointer['version']):
+        return cached
+
+    try:
+        with open(os.path.join(_snapshot_dir(key), f"{pointer['version']}.pkl"), 'rb') as f:
+            snapshot = pickle.load(f)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError, ImportError) as e:
+        print(f"Snapshot illisible pour {key} ({pointer['version']}): {e}")
+        return cached
+
+    _snapshots[key] = snapshot
+    return snapshot
+
+def request_refresh(key):
+    """Demande à refresh.py une reconstruction anticipée (bouton du tableau de bord)"""
+    os.makedirs(_snapshot_dir(key), exist_ok=True)
+    _atomic_write(_request_path(key), str(time.time()).encode('utf-8'))
+
+def refresh_requested(key):
+    return os.path.exists(_request_path(key))
+
+def clear_refresh_request(key):
+    try:
+        os.remove(_request_path(key))
+    except FileNotFoundError:
+        pass
+
+def snapshot_status(key):
+    """État du rafraîchissement : {'en_cours', 'demande', 'echec': None ou {'horodatage', 'message'}}"""
+    return {
+        'en_cours': key in _refreshing,
+        'demande': refresh_requested(key),
+        'echec': last_failure(key)
+    }
+
+def last_failure(key):
+    """Dernier échec de reconstruction non suivi d'un succès : None ou {'horodatage', 'message'}"""
+    try:
+        with open(_failure_path(key), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def format_age(secondes):
+    """Âge lisible d'un snapshot ('à l'instant', '12 min', '3 h 05', '2 j')"""
+    secondes = max(0, int(secondes))
+    if secondes < 60:
+        return "à l'instant"
+    if secondes < 3600:
+        return f"{secondes // 60} min"
+    if secondes < 86400:
+        return f"{secondes // 3600} h {secondes % 3600 // 60:02d}"
+    return f"{secondes // 86400} j"
+
+def _rebuild(key, builder):
+    try:
+        while True:
+            snapshot, erreur = build_snapshot(key, builder)
+            if snapshot is None:
+                print(f"Rafraîchissement du snapshot {key} échoué: {erreur}")
+
+            with _lock:
+                if key not in _rerun:
+                    break
+                _rerun.discard(key)
+    finally:
+        with _lock:
+            _refreshing.pop(key, None)
+
+def _sources_error(sources):
+    # Message d'échec d'une construction : erreurs des sources interrogées
+    erreurs = [f"{source['nom']}: {source['erreur']}" for source in sources or [] if source.get('erreur')]
+    return "; ".join(erreurs) or "aucune donnée réelle récupérée"
+
+def _snapshot_dir(key):
+    return os.path.join(SNAPSHOT_DIR, key)
+
+def _request_path(key):
+    return os.path.join(_snapshot_dir(key), 'refresh.request')
+
+def _failure_path(key):
+    return os.path.join(_snapshot_dir(key), 'echec.json')
+
+def _record_failure(key, message):
+    try:
+        os.makedirs(_snapshot_dir(key), exist_ok=True)
+        _atomic_write(_failure_path(key), json.dumps({'horodatage': time.time(), 'message': message}).encode('utf-8'))
+    except OSError as e:
+        print(f"Échec du snapshot {key} non enregistré: {e}")
+
+def _clear_failure(key):
+    try:
+        os.remove(_failure_path(key))
+    except FileNotFoundError:
+        pass
+
+def _read_pointer(key):
+    try:
+        with open(os.path.join(_snapshot_dir(key), 'current.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _prune_versions(directory, current_version):
+    versions = sorted(
+        (entry for entry in os.scandir(directory) if entry.name.endswith('.pkl')),
+        key=lambda entry: entry.stat().st_mtime
+    )
+    for entry in versions[:-KEEP_VERSIONS]:
+        if entry.name != f"{current_version}.pkl":
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+def _atomic_write(path, data):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,300 @@
+import io
+import csv
+import zipfile
+import pandas as pd
+from openpyxl import load_workbook
+from utils.schema_registry import header_fingerprint, lookup_schema, register_schema
+
+# Lignes lues par morceau dans les fichiers CSV volumineux
+CSV_CHUNKSIZE = 50_000
+
+# Octets lus en tête de fichier pour détecter encodage et séparateur
+SNIFF_BYTES = 64 * 1024
+
+CSV_ENCODINGS = ['utf-8-sig', 'cp1252']
+CSV_DELIMITERS = ';,\t|'
+
+# Lignes parcourues au début d'une feuille Excel pour trouver l'en-tête
+EXCEL_HEADER_SCAN_ROWS = 20
+
+# Mots identifiant une colonne de localisation dans les fichiers nationaux
+TERRITORY_COLUMN_WORDS = ['region', 'région', 'departement', 'département', 'territoire', 'localisation']
+
+def territory_columns(colonnes):
+    """Sépare les colonnes de localisation en colonnes de codes et colonnes de libellés"""
+    code_cols = []
+    label_cols = []
+
+    for colonne in colonnes:
+        nom = str(colonne).lower()
+        if not any(word in nom for word in TERRITORY_COLUMN_WORDS):
+            continue
+        if 'code' in nom:
+            code_cols.append(colonne)
+        else:
+            label_cols.append(colonne)
+
+    return code_cols, label_cols
+
+def territory_mask(df, code_cols, label_cols, territoire):
+    """Masque des lignes appartenant au territoire (codes INSEE ou libellés)
+
+    `territoire` est un dict {'codes': [...], 'codes_region': [...], 'noms': [...]} ;
+    les codes de région (04 pour La Réunion) ne sont comparés qu'aux colonnes
+    de région, où ils ne peuvent être confondus avec un département
+    métropolitain (04, Alpes-de-Haute-Provence). Sans colonne de
+    localisation, toutes les lignes sont conservées.
+    """
+    if not code_cols and not label_cols:
+        return pd.Series(True, index=df.index)
+
+    codes = {str(code).lstrip('0') for code in territoire.get('codes', [])}
+    codes_region = codes | {str(code).lstrip('0') for code in territoire.get('codes_region', [])}
+    noms = [_normalize_label(nom) for nom in territoire.get('noms', [])]
+
+    mask = pd.Series(False, index=df.index)
+
+    for colonne in code_cols:
+        values = df[colonne].astype(str).str.strip().str.lstrip('0')
+        mask |= values.isin(codes_region if _is_region_column(colonne) else codes).fillna(False).astype(bool)
+
+    for colonne in label_cols:
+        values = _normalize_labels(df[colonne])
+        # Certaines colonnes « Département » ou « Région » contiennent directement le code
+        attendus = codes_region if _is_region_column(colonne) else codes
+        mask |= values.str.strip().str.lstrip('0').isin(attendus).fillna(False).astype(bool)
+        for nom in noms:
+            mask |= values.str.contains(nom, regex=False).fillna(False).astype(bool)
+
+    return mask
+
+def _is_region_column(colonne):
+    nom = str(colonne).lower()
+    return 'region' in nom or 'région' in nom
+
+def filter_territory(df, territoire):
+    """Ne garde que les lignes du territoire d'un DataFrame déjà chargé"""
+    code_cols, label_cols = territory_columns(df.columns)
+    mask = territory_mask(df, code_cols, label_cols, territoire)
+    return df.loc[mask.to_numpy()]
+
+def resolve_csv_schema(path, column_roles, source_url=None):
+    """Détermine le dialecte, l'encodage et le rôle des colonnes d'un CSV
+
+    Seuls les premiers Ko du fichier sont lus. Un schéma déjà connu (même URL,
+    ou même en-tête publié ailleurs) est réutilisé tel quel ; sinon le schéma
+    détecté est enregistré pour les chargements suivants. Retourne None si
+    aucune colonne utile n'est reconnue : le fichier n'est alors pas parsé.
+    """
+    with open(path, 'rb') as f:
+        sample = f.read(SNIFF_BYTES)
+
+    # Couper à la dernière fin de ligne pour ne pas tronquer un caractère multi-octets
+    if len(sample) == SNIFF_BYTES and b'\n' in sample:
+        sample = sample[:sample.rindex(b'\n') + 1]
+
+    known = lookup_schema(source_url=source_url)
+    if known and _header_matches(sample, known):
+        return _usable(known)
+
+    encoding, text = _detect_encoding(sample)
+    delimiter, quotechar = _detect_dialect(text)
+
+    header = next(csv.reader(io.StringIO(text), delimiter=delimiter, quotechar=quotechar), [])
+    fingerprint = header_fingerprint(header)
+
+    known = lookup_schema(fingerprint=fingerprint)
+    if known and known['encoding'] == encoding and known['delimiter'] == delimiter:
+        register_schema(known, source_url)
+        return _usable(known)
+
+    roles = column_roles(header)
+    code_cols, label_cols = territory_columns(header)
+    usecols = list(dict.fromkeys([c for c in roles.values() if c] + code_cols + label_cols))
+
+    schema = {
+        'fingerprint': fingerprint,
+        'encoding': encoding,
+        'delimiter': delimiter,
+        'quotechar': quotechar,
+        'header': header,
+        'roles': roles,
+        'code_cols': code_cols,
+        'label_cols': label_cols,
+        'usecols': usecols
+    }
+    register_schema(schema, source_url)
+
+    return _usable(schema)
+
+def iter_territory_csv_chunks(path, schema, territoire, chunksize=CSV_CHUNKSIZE):
+    """Lit un CSV par morceaux en ne gardant que les colonnes utiles et les lignes du territoire
+
+    `schema` provient de resolve_csv_schema : séparateur, encodage et
+    colonnes sont connus d'avance, tout est lu en texte. La mémoire utilisée
+    reste bornée par la taille d'un morceau, quelle que soit la taille du fichier.
+    """
+    if not schema or not schema['usecols']:
+        return
+
+    reader = pd.read_csv(
+        path,
+        sep=schema['delimiter'],
+        quotechar=schema['quotechar'],
+        encoding=schema['encoding'],
+        usecols=schema['usecols'],
+        # Tout est lu en texte : les montants sont interprétés ensuite, sans inférence de type
+        dtype='str',
+        chunksize=chunksize
+    )
+
+    with reader:
+        for chunk in reader:
+            mask = territory_mask(chunk, schema['code_cols'], schema['label_cols'], territoire)
+            chunk = chunk.loc[mask.to_numpy()]
+            if not chunk.empty:
+                yield chunk
+
+def iter_territory_excel_chunks(path, needed_columns, territoire, chunksize=CSV_CHUNKSIZE):
+    """Lit la première feuille d'un classeur Excel en flux, colonne par colonne utile
+
+    Les classeurs .xlsx sont ouverts en lecture seule (openpyxl read_only) et
+    parcourus ligne par ligne : seules les cellules des colonnes retenues par
+    `needed_columns` et des colonnes de localisation sont conservées. Les
+    anciens fichiers .xls sont lus intégralement par pandas.
+    """
+    if not zipfile.is_zipfile(path):
+        yield from _filter_chunks([pd.read_excel(path)], needed_columns, territoire)
+        return
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+
+        header = _sniff_excel_header(rows, needed_columns)
+        if header is None:
+            return
+
+        code_cols, label_cols = territory_columns(header)
+        usecols = list(dict.fromkeys(list(needed_columns(header)) + code_cols + label_cols))
+        if not usecols:
+            return
+
+        indices = [header.index(colonne) for colonne in usecols]
+        text_cols = set(code_cols + label_cols)
+
+        buffer = []
+        for row in rows:
+            buffer.append([row[i] if i < len(row) else None for i in indices])
+            if len(buffer) >= chunksize:
+                chunk = _excel_chunk(buffer, usecols, text_cols, code_cols, label_cols, territoire)
+                if not chunk.empty:
+                    yield chunk
+                buffer = []
+
+        if buffer:
+            chunk = _excel_chunk(buffer, usecols, text_cols, code_cols, label_cols, territoire)
+            if not chunk.empty:
+                yield chunk
+    finally:
+        workbook.close()
+
+def _usable(schema):
+    """Un schéma sans aucune colonne reconnue ne mérite pas de parser le fichier"""
+    return schema if any(schema['roles'].values()) else None
+
+def _detect_encoding(sample):
+    """Premier encodage candidat capable de décoder l'échantillon"""
+    for encoding in CSV_ENCODINGS:
+        try:
+            return encoding, sample.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return 'latin-1', sample.decode('latin-1')
+
+def _detect_dialect(text):
+    """Séparateur et guillemet d'un échantillon CSV"""
+    try:
+        dialect = csv.Sniffer().sniff(text, delimiters=CSV_DELIMITERS)
+        return dialect.delimiter, dialect.quotechar or '"'
+    except csv.Error:
+        # Repli : le séparateur candidat le plus fréquent sur la ligne d'en-tête
+        first_line = text.split('\n', 1)[0]
+        return max(CSV_DELIMITERS, key=first_line.count), '"'
+
+def _header_matches(sample, schema):
+    """Vérifie qu'un schéma connu correspond toujours à l'en-tête du fichier"""
+    try:
+        text = sample.decode(schema['encoding'])
+    except (UnicodeDecodeError, LookupError):
+        return False
+
+    header = next(csv.reader(io.StringIO(text), delimiter=schema['delimiter'], quotechar=schema['quotechar']), [])
+    return header_fingerprint(header) == schema['fingerprint']
+
+def _sniff_excel_header(rows, needed_columns):
+    """Repère la ligne d'en-tête parmi les premières lignes d'une feuille
+
+    Retient la première ligne dont les colonnes sont reconnues par le mapping,
+    sinon la première ligne non vide. Les lignes d'en-tête écartées sont consommées.
+    """
+    first_non_empty = None
+
+    for _ in range(EXCEL_HEADER_SCAN_ROWS):
+        row = next(rows, None)
+        if row is None:
+            break
+        if not any(cell is not None and str(cell).strip() for cell in row):
+            continue
+
+        header = ['' if cell is None else str(cell).strip() for cell in row]
+        if needed_columns(header):
+            return header
+        if first_non_empty is None:
+            first_non_empty = header
+
+    return first_non_empty
+
+def _excel_chunk(buffer, usecols, text_cols, code_cols, label_cols, territoire):
+    """Construit un morceau à partir des lignes lues et ne garde que le territoire"""
+    chunk = pd.DataFrame(buffer, columns=usecols)
+
+    # Les codes saisis comme nombres (974 ou 974.0) sont comparés sous forme texte
+    for colonne in text_cols:
+        chunk[colonne] = chunk[colonne].map(_cell_to_text)
+
+    mask = territory_mask(chunk, code_cols, label_cols, territoire)
+    return chunk.loc[mask.to_numpy()]
+
+def _cell_to_text(value):
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+def _filter_chunks(chunks, needed_columns, territoire):
+    """Applique l'élagage des colonnes et le filtre territorial à des DataFrames déjà lus"""
+    for chunk in chunks:
+        code_cols, label_cols = territory_columns(chunk.columns)
+        usecols = list(dict.fromkeys(list(needed_columns(chunk.columns)) + code_cols + label_cols))
+        if not usecols:
+            continue
+        chunk = filter_territory(chunk[usecols], territoire)
+        if not chunk.empty:
+            yield chunk
+
+def _normalize_label(text):
+    """Libellé en minuscules, sans accents ni tirets"""
+    return _normalize_labels(pd.Series([text])).iloc[0]
+
+def _normalize_labels(series):
+    """Version vectorisée de _normalize_label"""
+    return (
+        series.astype(str)
+        .str.lower()
+        .str.normalize('NFKD')
+        .str.encode('ascii', errors='ignore')
+        .str.decode('ascii')
+        .str.replace('-', ' ', regex=False)
+    )
@@ -0,0 +1,305 @@
+import os
+import re
+import json
+import time
+import pickle
+import threading
+import unicodedata
+from utils.http_cache import CACHE_DIR
+from utils.file_lock import file_lock, LockTimeout
+from utils.data_processor import collect_records
+
+SOURCE_DIR = os.path.join(CACHE_DIR, 'sources')
+
+# Coût total des sources interrogées lors d'une même construction ; une source
+# sans aucun résultat en cache est toujours interrogée, quel que soit son coût
+REFRESH_BUDGET = 10
+
+# Délai avant de réinterroger une source dont la dernière interrogation a échoué (en secondes)
+FAILURE_RETRY = 300
+
+# Délai minimum entre deux interrogations d'une même source demandées depuis le
+# tableau de bord, compté depuis sa dernière interrogation ou invalidation (en secondes)
+INVALIDATION_COOLDOWN = 300
+
+# Attente maximum du verrou d'une source lors d'une invalidation (en secondes) : au-delà,
+# la source est en cours d'interrogation et la demande est refusée sans bloquer la page
+INVALIDATION_LOCK_TIMEOUT = 2
+
+# Attente maximum de l'interrogation d'une source déjà en cours dans un autre processus (en secondes),
+# prolongée jusqu'au délai de la source quand il est plus long
+LOCK_TIMEOUT = 300
+
+# Délai laissé par défaut à l'interrogation d'une source lors d'une construction (en secondes)
+SOURCE_DEADLINE = 120
+
+def source(nom, fonction, ttl=3600, cout=1, priorite=1, secours=None, delai=SOURCE_DEADLINE, forcee=None):
+    """Déclare une source de données pour le registre
+
+    `fonction` retourne un itérable d'enregistrements (dicts) ou de lots
+    (listes de dicts, DataFrames) : une liste suffit pour une petite source,
+    une source volumineuse est un générateur qui produit ses lots au fil de
+    l'eau, sans jamais construire la liste de tous ses dicts. En cas
+    d'erreur de téléchargement ou de parsing, elle lève une exception
+    (jamais de données de repli à la place des vraies).
+    `ttl` : durée de validité de son dernier résultat (en secondes) ;
+    `cout` : coût relatif d'une interrogation (réseau, parsing) ;
+    `priorite` : 1 est la plus haute, interrogée en premier quand le budget est limité ;
+    `secours` : fonction sans argument retournant des données de référence,
+    utilisées tant qu'aucun résultat réel n'a jamais été enregistré, et
+    jamais mises en cache comme résultat de la source ;
+    `delai` : temps laissé à une interrogation avant de la déclarer en
+    'timeout' (long pour un catalogue complet et des fichiers nationaux) ;
+    `forcee` : variante de `fonction` qui ignore les caches propres à la
+    source (ex. fichiers déjà parsés), appelée pour une actualisation forcée
+    ou demandée explicitement (invalidate_sources).
+    """
+    return {
+        'nom': nom,
+        'fonction': fonction,
+        'ttl': ttl,
+        'cout': cout,
+        'priorite': priorite,
+        'secours': secours,
+        'delai': delai,
+        'forcee': forcee
+    }
+
+def plan_refresh(key, sources, force=False, budget=REFRESH_BUDGET, depuis=None):
+    """Sources à interroger maintenant, par ordre de priorité
+
+    Une source est due quand son dernier résultat a dépassé son TTL (ou
+    n'existe pas), et au plus toutes les FAILURE_RETRY secondes après un
+    échec ; une source invalidée (invalidate_sources) est due tout de suite.
+    `force` rend dues toutes les sources sans résultat plus récent que
+    `depuis` (horodatage de la demande, par défaut maintenant) : une
+    construction qui a attendu celle d'un autre processus reprend ses
+    résultats. Les sources dues sont retenues par priorité puis coût
+    croissant, dans la limite de `budget` ; celles sans cache ou invalidées
+    le sont toujours.
+    """
+    depuis = depuis or time.time()
+    dues = []
+    for src in sources:
+        meta = load_source_meta(key, src['nom'])
+        recent = meta is not None and (meta['horodatage'] or 0) >= depuis
+        if (force and not recent) or _due_in(src, meta) <= 0:
+            hors_budget = meta is None or meta['horodatage'] is None or bool(meta.get('invalide'))
+            dues.append((not hors_budget, src))
+
+    dues.sort(key=lambda item: (item[1]['priorite'], item[1]['cout']))
+
+    selected = []
+    spent = 0
+    for budgete, src in dues:
+        if budgete and spent + src['cout'] > budget:
+            continue
+        selected.append(src)
+        spent += src['cout']
+
+    return selected
+
+def next_due(key, sources):
+    """Secondes avant qu'une source ne dépasse son TTL (0 si l'une est déjà due)"""
+    delays = [_due_in(src, load_source_meta(key, src['nom'])) for src in sources]
+    return max(0, min(delays)) if delays else 0
+
+def invalidate_sources(key, sources, noms=None, cooldown=INVALIDATION_COOLDOWN):
+    """Marque des sources d'un territoire comme périmées, pour la prochaine construction
+
+    `noms` : sources à invalider (toutes si None). Une source interrogée ou
+    invalidée il y a moins de `cooldown` secondes est refusée : les clics
+    répétés ou simultanés ne déclenchent qu'une interrogation. La
+    vérification et l'écriture se font sous le verrou de la source pris par
+    refresh_source : une source en cours d'interrogation est refusée, et
+    son résultat n'est jamais écrasé par une invalidation. Retourne
+    (noms invalidés, {nom refusé: secondes avant qu'il soit possible}).
+    """
+    acceptees = []
+    refusees = {}
+
+    for src in sources:
+        nom = src['nom']
+        if noms is not None and nom not in noms:
+            continue
+
+        try:
+            with file_lock(key, nom, timeout=INVALIDATION_LOCK_TIMEOUT):
+                now = time.time()
+                meta = load_source_meta(key, nom) or {'horodatage': None, 'duree': None, 'projets': 0}
+                derniere = max(meta['horodatage'] or 0, meta.get('echec') or 0, meta.get('invalide') or 0)
+                if now - derniere < cooldown:
+                    refusees[nom] = derniere + cooldown - now
+                    continue
+
+                meta['invalide'] = now
+                _write_meta(key, nom, meta)
+                acceptees.append(nom)
+        except LockTimeout:
+            # Interrogation en cours : son résultat sera tout frais
+            refusees[nom] = cooldown
+
+    return acceptees, refusees
+
+def refresh_source(key, src, demande=None, force=False):
+    """Interroge une source et enregistre son résultat, un seul processus à la fois
+
+    Si la même source du même territoire est déjà interrogée ailleurs (autre
+    fil, autre processus refresh.py ou Streamlit), attend la fin de cette
+    interrogation et reprend son résultat au lieu d'interroger la source une
+    seconde fois ; de même pour un échec. `demande` est l'horodatage à partir
+    duquel un résultat est réutilisable (par défaut : l'appel). Le flux de
+    la source est consommé ici, dans le fil de l'interrogation, et rangé en
+    colonnes (collect_records). Avec `force`, ou si la source a été
+    invalidée, sa variante `forcee` est appelée quand elle en déclare une.
+    Retourne les lignes de la source (DataFrame,
+    ou liste de dicts pour un cache antérieur), ou lève l'exception de
+    l'interrogation.
+    """
+    nom = src['nom']
+    demande = demande or time.time()
+
+    with file_lock(key, nom, timeout=max(LOCK_TIMEOUT, src.get('delai', SOURCE_DEADLINE))):
+        meta = load_source_meta(key, nom)
+        if meta is not None and not meta.get('invalide'):
+            if meta['horodatage'] and meta['horodatage'] >= demande:
+                cached = load_source_result(key, nom)
+                if cached is not None:
+                    return cached['donnees']
+            if meta.get('echec') and meta['echec'] >= demande:
+                raise RuntimeError("échec de l'interrogation menée par un autre processus")
+
+        fonction = src['fonction']
+        if (force or (meta is not None and meta.get('invalide'))) and src.get('forcee') is not None:
+            fonction = src['forcee']
+
+        start = time.monotonic()
+        try:
+            donnees = collect_records(fonction())
+        except Exception:
+            record_source_failure(key, nom)
+            raise
+
+        if len(donnees):
+            store_source_result(key, nom, donnees, time.monotonic() - start)
+        else:
+            record_source_failure(key, nom)
+        return donnees
+
+def merge_results(key, sources, results):
+    """Fusionne les résultats frais avec les derniers résultats en cache des autres sources
+
+    `results` vient de fetch_all_sources pour les sources interrogées par
+    refresh_source, qui a déjà mis à jour leur cache ; en cas d'échec, le
+    dernier résultat réussi est conservé. Une source qui n'a encore jamais
+    donné de résultat réel est remplacée par ses données de référence
+    (`secours`), signalées par 'reference' dans le résumé. Retourne (lots de
+    lignes, un par source, à passer tels quels à process_funds_data ;
+    résumé par source {'nom', 'erreur', 'projets', 'horodatage', 'rafraichi', 'reference'}).
+    """
+    fresh = {result['nom']: result for result in results}
+    lots = []
+    summary = []
+
+    for src in sources:
+        result = fresh.get(src['nom'])
+        erreur = None
+        rafraichi = False
+
+        if result is not None and result['donnees'] is not None and len(result['donnees']) and not result['erreur']:
+            rafraichi = True
+        elif result is not None:
+            erreur = result['erreur'] or "aucun projet trouvé"
+
+        cached = load_source_result(key, src['nom'])
+        reference = cached is None and src.get('secours') is not None
+        if cached is not None:
+            donnees = cached['donnees']
+        elif reference:
+            donnees = src['secours']()
+        else:
+            donnees = []
+        if len(donnees):
+            lots.append(donnees)
+
+        summary.append({
+            'nom': src['nom'],
+            'erreur': erreur,
+            'projets': len(donnees),
+            'horodatage': cached['horodatage'] if cached else None,
+            'rafraichi': rafraichi,
+            'reference': reference
+        })
+
+    return lots, summary
+
+def load_source_meta(key, nom):
+    """Métadonnées de la source : {'horodatage', 'duree', 'projets', 'echec', 'invalide'} ou None
+
+    `horodatage` est celui du dernier résultat réussi (None s'il n'y en a
+    jamais eu), `echec` celui de la dernière interrogation échouée depuis,
+    `invalide` celui d'une invalidation pas encore servie.
+    Lues sans charger les données, pour planifier les interrogations.
+    """
+    try:
+        with open(_result_path(key, nom, 'json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def load_source_result(key, nom):
+    """Dernier résultat réussi d'une source : {'donnees', 'horodatage', 'duree'} ou None"""
+    try:
+        with open(_result_path(key, nom, 'pkl'), 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError) as e:
+        print(f"Résultat en cache illisible pour {nom}: {e}")
+        return None
+
+def store_source_result(key, nom, donnees, duree=None):
+    """Enregistre le résultat réussi d'une source (données, puis métadonnées)"""
+    horodatage = time.time()
+    meta = {'horodatage': horodatage, 'duree': duree, 'projets': len(donnees), 'echec': None}
+
+    path = _result_path(key, nom, 'pkl')
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    _atomic_write(path, pickle.dumps({'donnees': donnees, 'horodatage': horodatage, 'duree': duree}))
+    _atomic_write(_result_path(key, nom, 'json'), json.dumps(meta).encode('utf-8'))
+
+def record_source_failure(key, nom):
+    """Note l'échec d'une interrogation, sans toucher au dernier résultat réussi"""
+    meta = load_source_meta(key, nom) or {'horodatage': None, 'duree': None, 'projets': 0}
+    meta['echec'] = time.time()
+    meta.pop('invalide', None)
+    _write_meta(key, nom, meta)
+
+def _write_meta(key, nom, meta):
+    path = _result_path(key, nom, 'json')
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _atomic_write(path, json.dumps(meta).encode('utf-8'))
+    except OSError as e:
+        print(f"Métadonnées non enregistrées pour {nom}: {e}")
+
+def _due_in(src, meta):
+    # Secondes avant que la source ne soit due (négatif ou nul : due maintenant)
+    if meta is None or meta.get('invalide'):
+        return 0
+    now = time.time()
+    due = 0 if meta['horodatage'] is None else meta['horodatage'] + src['ttl'] - now
+    if meta.get('echec'):
+        due = max(due, meta['echec'] + FAILURE_RETRY - now)
+    return due
+
+def _result_path(key, nom, extension):
+    ascii_nom = unicodedata.normalize('NFKD', nom).encode('ascii', 'ignore').decode('ascii')
+    slug = re.sub(r'[^a-z0-9]+', '_', ascii_nom.lower()).strip('_')
+    return os.path.join(SOURCE_DIR, key, f"{slug}.{extension}")
+
+def _atomic_write(path, data):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
@@ -0,0 +1,61 @@
+from utils.keyword_classifier import commune_rules
+
+# Taxonomies de classement des projets (Mayotte)
+# Chaque axe liste ses règles par ordre de priorité : la première règle dont un
+# mot-clé apparaît dans le texte l'emporte, sinon le libellé par défaut est utilisé.
+
+COMMUNES = [
+    'Mamoudzou', 'Dzaoudzi', 'Pamandzi', 'Koungou', 'Sada',
+    'Chiconi', 'Bandrele', 'Bouéni', 'Chirongui', 'Dembeni'
+]
+
+EUROPE_DIRECT = {
+    'programme': {
+        'regles': [
+            ('FEDER', ['feder', 'développement régional']),
+            ('FSE', ['fse', 'social']),
+            ('FEADER', ['feader', 'agricole']),
+            ('INTERREG', ['interreg', 'coopération'])
+        ],
+        'defaut': 'FEDER'
+    },
+    'secteur': {
+        'regles': [
+            ('Agriculture', ['agriculture', 'agri', 'rural']),
+            ('Tourisme', ['tourisme', 'touristique']),
+            ('Recherche', ['recherche', 'innovation', 'numérique']),
+            ('Formation', ['formation', 'emploi', 'social']),
+            ('Environnement', ['environnement', 'énergie', 'durable', 'eau']),
+            ('Transport', ['transport', 'mobilité', 'infrastructure'])
+        ],
+        'defaut': 'Développement régional'
+    }
+}
+
+REGION = {
+    'programme': {
+        'regles': [
+            ('FEDER', ['feder']),
+            ('FSE', ['fse']),
+            ('FEADER', ['feader']),
+            ('INTERREG', ['interreg'])
+        ],
+        'defaut': 'FEDER'
+    },
+    'secteur': {
+        'regles': [
+            ('Agriculture', ['agriculture', 'agri', 'rural', 'filière', 'pêche']),
+            ('Tourisme', ['tourisme', 'touristique', 'hôtellerie']),
+            ('Formation', ['formation', 'emploi', 'compétence', 'insertion', 'éducation']),
+            ('Environnement', ['environnement', 'énergie', 'renouvelable', 'durable', 'eau', 'assainissement']),
+            ('Recherche', ['recherche', 'innovation', 'numérique', 'technologie']),
+            ('Transport', ['transport', 'mobilité', 'infrastructure', 'port', 'route']),
+            ('Santé', ['santé', 'médical', 'social'])
+        ],
+        'defaut': 'Développement régional'
+    },
+    'commune': {
+        'regles': commune_rules(COMMUNES),
+        'defaut': 'Mayotte'
+    }
+}
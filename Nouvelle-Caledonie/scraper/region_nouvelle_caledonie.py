@@ -1,44 +1,47 @@
-import requests
-from bs4 import BeautifulSoup
 import re
+from utils.http_session import http_get
+from utils.html_parsing import find_candidate_blocks
+from utils.keyword_classifier import compile_taxonomy, classify
+from utils.source_registry import source
+from utils.record_ids import record_id
+from scraper.taxonomie_nouvelle_caledonie import REGION
+
+# Compilé une fois à l'import : programme, secteur et commune sont déduits en un seul appel, texte mis en minuscules une fois
+CLASSIFIEUR = compile_taxonomy(REGION)
 
 def scrape_region_nouvelle_caledonie():
     """Scrape le site du Gouvernement de la Nouvelle-Calédonie pour les fonds européens"""
     
-    try:
-        # URL des fonds européens du Gouvernement de la Nouvelle-Calédonie
-        url = "https://www.gouv.nc/fonds-europeens"
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        projects_data = []
-        
-        # Recherche des actualités ou projets
-        articles = soup.find_all(['article', 'div'], class_=re.compile(r'actualite|project|news'))
-        
-        for article in articles[:15]:
-            try:
-                project_data = extract_region_project_data(article)
-                if project_data:
-                    projects_data.append(project_data)
-            except Exception as e:
-                continue
-        
-        if not projects_data:
-            return generate_region_fallback()
-        
-        return projects_data
-        
-    except Exception as e:
-        print(f"Erreur scraping Gouvernement NC: {e}")
-        return generate_region_fallback()
+    # URL des fonds européens du Gouvernement de la Nouvelle-Calédonie
+    url = "https://www.gouv.nc/fonds-europeens"
+    
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+    }
+    
+    response = http_get(url, headers=headers, timeout=10)
+    response.raise_for_status()
+    
+    projects_data = []
+    
+    # Recherche des actualités ou projets (seuls ces blocs sont parsés, avec lxml).
+    # Un article et ses div internes décrivent le même projet : seul le bloc externe est gardé,
+    # sauf s'il regroupe plusieurs blocs (liste d'actualités), auquel cas ce sont ses éléments
+    articles = find_candidate_blocks(response.content, ['article', 'div'], r'actualite|project|news', mode='items')
+    
+    for article in articles[:15]:
+        try:
+            project_data = extract_region_project_data(article)
+            if project_data:
+                projects_data.append(project_data)
+        except Exception as e:
+            continue
+    
+    # Aucun projet reconnu : la structure de la page a changé, la source est en échec
+    if not projects_data:
+        raise ValueError("aucun projet trouvé sur la page")
+    
+    return projects_data
 
 def extract_region_project_data(article):
     """Extrait les données d'un projet depuis un article du Gouvernement de la Nouvelle-Calédonie"""
@@ -57,12 +60,13 @@ def extract_region_project_data(article):
     montant = float(montant_match.group(1).replace(' ', '')) if montant_match else 500000
     
     # Déduire les informations
-    programme = deduce_programme_region(full_text)
-    secteur = deduce_secteur_region(full_text)
-    commune = deduce_commune(full_text)
+    categories = classify(full_text, CLASSIFIEUR)
+    programme = categories['programme']
+    secteur = categories['secteur']
+    commune = categories['commune']
     
     return {
-        'id': f"REG_{hash(title) % 10000:04d}",
+        'id': record_id('REG', 'Gouvernement de la Nouvelle-Calédonie', title, montant),
         'titre': title,
         'programme': programme,
         'secteur': secteur,
@@ -79,54 +83,15 @@ def extract_region_project_data(article):
 
 def deduce_programme_region(text):
     """Déduit le programme pour le Gouvernement de la Nouvelle-Calédonie"""
-    text_lower = text.lower()
-    
-    if 'feder' in text_lower:
-        return 'FEDER'
-    elif 'fse' in text_lower:
-        return 'FSE'
-    elif 'feader' in text_lower:
-        return 'FEADER'
-    elif 'interreg' in text_lower:
-        return 'INTERREG'
-    else:
-        return 'FEDER'
+    return classify(text, CLASSIFIEUR)['programme']
 
 def deduce_secteur_region(text):
     """Déduit le secteur pour le Gouvernement de la Nouvelle-Calédonie"""
-    text_lower = text.lower()
-    
-    sectors_keywords = {
-        'Agriculture': ['agriculture', 'agri', 'rural', 'filière', 'élevage'],
-        'Tourisme': ['tourisme', 'touristique', 'hôtellerie', 'lagon', 'croisière'],
-        'Formation': ['formation', 'emploi', 'compétence', 'insertion', 'éducation'],
-        'Environnement': ['environnement', 'énergie', 'renouvelable', 'durable', 'solaire', 'biodiversité'],
-        'Recherche': ['recherche', 'innovation', 'numérique', 'technologie'],
-        'Transport': ['transport', 'mobilité', 'infrastructure', 'port', 'aéroport', 'route'],
-        'Santé': ['santé', 'médical', 'social'],
-        'Industrie': ['nickel', 'industrie', 'minier', 'métallurgie', 'usine']
-    }
-    
-    for sector, keywords in sectors_keywords.items():
-        if any(keyword in text_lower for keyword in keywords):
-            return sector
-    
-    return 'Développement régional'
+    return classify(text, CLASSIFIEUR)['secteur']
 
 def deduce_commune(text):
     """Déduit la commune basée sur le texte"""
-    text_lower = text.lower()
-    
-    communes = [
-        'Nouméa', 'Dumbéa', 'Païta', 'Le Mont-Dore', 'Bourail',
-        'La Foa', 'Sarraméa', 'Farino', 'Moindou', 'Thio'
-    ]
-    
-    for commune in communes:
-        if commune.lower().replace('-', ' ') in text_lower:
-            return commune
-    
-    return 'Nouvelle-Calédonie'
+    return classify(text, CLASSIFIEUR)['commune']
 
 def generate_region_fallback():
     """Génère des données de fallback pour le Gouvernement de la Nouvelle-Calédonie"""
@@ -180,4 +145,7 @@ def generate_region_fallback():
             'source': 'Gouvernement de la Nouvelle-Calédonie (données de référence)'
         })
     
-    return data
\ No newline at end of file
+    return data
+
+# Déclaration pour le registre des sources. Page d'actualités : la plus changeante
+SOURCE = source("Gouvernement NC", scrape_region_nouvelle_caledonie, ttl=3600, cout=1, priorite=1, secours=generate_region_fallback)
@@ -0,0 +1,63 @@
+from utils.keyword_classifier import commune_rules
+
+# Taxonomies de classement des projets (Nouvelle-Calédonie)
+# Chaque axe liste ses règles par ordre de priorité : la première règle dont un
+# mot-clé apparaît dans le texte l'emporte, sinon le libellé par défaut est utilisé.
+
+COMMUNES = [
+    'Nouméa', 'Dumbéa', 'Païta', 'Le Mont-Dore', 'Bourail',
+    'La Foa', 'Sarraméa', 'Farino', 'Moindou', 'Thio'
+]
+
+EUROPE_DIRECT = {
+    'programme': {
+        'regles': [
+            ('FEDER', ['feder', 'développement régional']),
+            ('FSE', ['fse', 'social']),
+            ('FEADER', ['feader', 'agricole']),
+            ('INTERREG', ['interreg', 'coopération'])
+        ],
+        'defaut': 'FEDER'
+    },
+    'secteur': {
+        'regles': [
+            ('Agriculture', ['agriculture', 'agri', 'rural']),
+            ('Tourisme', ['tourisme', 'touristique', 'lagon']),
+            ('Recherche', ['recherche', 'innovation', 'numérique']),
+            ('Formation', ['formation', 'emploi', 'social']),
+            ('Environnement', ['environnement', 'énergie', 'durable', 'solaire']),
+            ('Transport', ['transport', 'mobilité', 'infrastructure']),
+            ('Industrie', ['nickel', 'industrie', 'minier'])
+        ],
+        'defaut': 'Développement régional'
+    }
+}
+
+REGION = {
+    'programme': {
+        'regles': [
+            ('FEDER', ['feder']),
+            ('FSE', ['fse']),
+            ('FEADER', ['feader']),
+            ('INTERREG', ['interreg'])
+        ],
+        'defaut': 'FEDER'
+    },
+    'secteur': {
+        'regles': [
+            ('Agriculture', ['agriculture', 'agri', 'rural', 'filière', 'élevage']),
+            ('Tourisme', ['tourisme', 'touristique', 'hôtellerie', 'lagon', 'croisière']),
+            ('Formation', ['formation', 'emploi', 'compétence', 'insertion', 'éducation']),
+            ('Environnement', ['environnement', 'énergie', 'renouvelable', 'durable', 'solaire', 'biodiversité']),
+            ('Recherche', ['recherche', 'innovation', 'numérique', 'technologie']),
+            ('Transport', ['transport', 'mobilité', 'infrastructure', 'port', 'aéroport', 'route']),
+            ('Santé', ['santé', 'médical', 'social']),
+            ('Industrie', ['nickel', 'industrie', 'minier', 'métallurgie', 'usine'])
+        ],
+        'defaut': 'Développement régional'
+    },
+    'commune': {
+        'regles': commune_rules(COMMUNES),
+        'defaut': 'Nouvelle-Calédonie'
+    }
+}
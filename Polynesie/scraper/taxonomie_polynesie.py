@@ -0,0 +1,63 @@
+from utils.keyword_classifier import commune_rules
+
+# Taxonomies de classement des projets (Polynésie)
+# Chaque axe liste ses règles par ordre de priorité : la première règle dont un
+# mot-clé apparaît dans le texte l'emporte, sinon le libellé par défaut est utilisé.
+
+COMMUNES = [
+    'Papeete', "Faa'a", 'Punaauia', 'Pirae', 'Mahina',
+    'Papara', 'Arue', 'Faaone', 'Paea', 'Vaitape'
+]
+
+EUROPE_DIRECT = {
+    'programme': {
+        'regles': [
+            ('FEDER', ['feder', 'développement régional']),
+            ('FSE', ['fse', 'social']),
+            ('FEADER', ['feader', 'agricole']),
+            ('INTERREG', ['interreg', 'coopération'])
+        ],
+        'defaut': 'FEDER'
+    },
+    'secteur': {
+        'regles': [
+            ('Agriculture', ['agriculture', 'agri', 'rural']),
+            ('Tourisme', ['tourisme', 'touristique', 'lagon', 'croisière']),
+            ('Recherche', ['recherche', 'innovation', 'numérique']),
+            ('Formation', ['formation', 'emploi', 'social']),
+            ('Environnement', ['environnement', 'énergie', 'durable', 'solaire']),
+            ('Transport', ['transport', 'mobilité', 'infrastructure']),
+            ('Pêche', ['pêche', 'thon', 'perle'])
+        ],
+        'defaut': 'Développement régional'
+    }
+}
+
+REGION = {
+    'programme': {
+        'regles': [
+            ('FEDER', ['feder']),
+            ('FSE', ['fse']),
+            ('FEADER', ['feader']),
+            ('INTERREG', ['interreg'])
+        ],
+        'defaut': 'FEDER'
+    },
+    'secteur': {
+        'regles': [
+            ('Agriculture', ['agriculture', 'agri', 'rural', 'filière', 'vanille', 'noni']),
+            ('Tourisme', ['tourisme', 'touristique', 'hôtellerie', 'lagon', 'croisière', 'perle']),
+            ('Formation', ['formation', 'emploi', 'compétence', 'insertion', 'éducation']),
+            ('Environnement', ['environnement', 'énergie', 'renouvelable', 'durable', 'solaire', 'biodiversité', 'corail']),
+            ('Recherche', ['recherche', 'innovation', 'numérique', 'technologie', 'climat']),
+            ('Transport', ['transport', 'mobilité', 'infrastructure', 'port', 'aéroport', 'ferry']),
+            ('Santé', ['santé', 'médical', 'social']),
+            ('Pêche', ['pêche', 'thon', 'aquaculture', 'pêcheur'])
+        ],
+        'defaut': 'Développement régional'
+    },
+    'commune': {
+        'regles': commune_rules(COMMUNES, separators="-'"),
+        'defaut': 'Polynésie'
+    }
+}
@@ -0,0 +1,155 @@
+import os
+import re
+import json
+import time
+import random
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from utils.host_health import host_of
+from utils.http_cache import CACHE_DIR
+from utils.file_lock import file_lock
+
+# État des seaux à jetons, partagé par tous les processus de la machine (refresh_all.py lance
+# un processus par territoire : le débit de HOST_RATES est celui de la machine entière)
+RATE_DIR = os.path.join(CACHE_DIR, 'rate')
+
+# Débit maximum par hôte pour toute la machine (requêtes par seconde) et rafale autorisée
+HOST_RATES = {
+    'www.data.gouv.fr': (10.0, 10),
+    'static.data.gouv.fr': (10.0, 10),
+}
+DEFAULT_RATE = (4.0, 4)
+
+# Débit plancher après des ralentissements répétés (requêtes par seconde)
+MIN_RATE = 0.5
+
+# Regain de débit après chaque réponse acceptée, jusqu'au maximum de l'hôte
+RATE_INCREASE = 0.1
+
+# Nouvelles tentatives : statuts concernés, nombre d'essais et délais (en secondes)
+RETRY_STATUSES = {429, 502, 503, 504}
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+MAX_BACKOFF = 8
+MAX_RETRY_AFTER = 60
+
+_lock = threading.Lock()
+
+def acquire(url):
+    """Attend qu'un jeton soit disponible pour l'hôte de `url`
+
+    Le seau à jetons est partagé par les fils et par les processus de la
+    machine (refresh.py de chaque territoire, instances Streamlit).
+    """
+    host = host_of(url)
+
+    while True:
+        with _shared_bucket(host) as bucket:
+            now = time.time()
+            bucket['jetons'] = min(bucket['rafale'], bucket['jetons'] + max(0, now - bucket['maj']) * bucket['debit'])
+            bucket['maj'] = now
+
+            attente = bucket['bloque_jusqu_a'] - now
+            if attente <= 0:
+                if bucket['jetons'] >= 1:
+                    bucket['jetons'] -= 1
+                    return
+                attente = (1 - bucket['jetons']) / bucket['debit']
+
+        time.sleep(attente)
+
+def slow_down(url, retry_after=None):
+    """L'hôte a refusé ou saturé (429, 503...) : débit divisé par deux, pause éventuelle pour tous les processus"""
+    host = host_of(url)
+    with _shared_bucket(host) as bucket:
+        bucket['debit'] = max(MIN_RATE, bucket['debit'] / 2)
+        bucket['jetons'] = min(bucket['jetons'], 0)
+        if retry_after:
+            pause = min(retry_after, MAX_RETRY_AFTER)
+            bucket['bloque_jusqu_a'] = max(bucket['bloque_jusqu_a'], time.time() + pause)
+
+def speed_up(url):
+    """Réponse acceptée : le débit remonte progressivement vers le maximum de l'hôte"""
+    host = host_of(url)
+    with _shared_bucket(host) as bucket:
+        bucket['debit'] = min(bucket['debit_max'], bucket['debit'] + RATE_INCREASE)
+
+def retry_delay(attempt, response=None):
+    """Délai avant la tentative suivante, ou None s'il ne faut pas réessayer
+
+    Retry-After (en secondes ou en date HTTP) est respecté tant qu'il ne
+    dépasse pas MAX_RETRY_AFTER ; sinon backoff exponentiel avec gigue
+    complète (entre 0 et BACKOFF_BASE * 2^attempt, plafonné à MAX_BACKOFF).
+    """
+    if attempt >= MAX_RETRIES:
+        return None
+
+    retry_after = parse_retry_after(response)
+    if retry_after is not None:
+        return retry_after if retry_after <= MAX_RETRY_AFTER else None
+
+    return random.uniform(0, min(MAX_BACKOFF, BACKOFF_BASE * 2 ** attempt))
+
+def parse_retry_after(response):
+    """Valeur de l'en-tête Retry-After en secondes, ou None"""
+    if response is None:
+        return None
+
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - datetime.now(timezone.utc)).total_seconds())
+
+@contextmanager
+def _shared_bucket(host):
+    """Seau à jetons d'un hôte, lu puis réécrit sous verrou de fichier
+
+    Le verrou du processus passe d'abord, pour que ses fils ne se
+    disputent pas le verrou de fichier.
+    """
+    with _lock, file_lock('rate', host):
+        bucket = _read_bucket(host)
+        yield bucket
+        _write_bucket(host, bucket)
+
+def _read_bucket(host):
+    debit, rafale = HOST_RATES.get(host, DEFAULT_RATE)
+    try:
+        with open(_bucket_path(host), encoding='utf-8') as f:
+            bucket = json.load(f)
+    except (OSError, ValueError):
+        return {'debit': debit, 'debit_max': debit, 'rafale': rafale, 'jetons': rafale,
+                'maj': time.time(), 'bloque_jusqu_a': 0}
+
+    # Maximum de l'hôte changé depuis l'écriture de l'état : il s'applique tout de suite
+    bucket['debit_max'] = debit
+    bucket['rafale'] = rafale
+    bucket['debit'] = min(bucket['debit'], debit)
+    return bucket
+
+def _write_bucket(host, bucket):
+    path = _bucket_path(host)
+    try:
+        os.makedirs(RATE_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(bucket, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"État du limiteur non enregistré pour {host}: {e}")
+
+def _bucket_path(host):
+    return os.path.join(RATE_DIR, re.sub(r'[^a-z0-9.-]+', '_', host.lower()) + '.json')
@@ -0,0 +1,61 @@
+from utils.keyword_classifier import commune_rules
+
+# Taxonomies de classement des projets (Saint-Barthélemy)
+# Chaque axe liste ses règles par ordre de priorité : la première règle dont un
+# mot-clé apparaît dans le texte l'emporte, sinon le libellé par défaut est utilisé.
+
+COMMUNES = [
+    'Gustavia', 'Lorient', 'Saint-Jean', 'Anse des Cayes', 'Gouverneur'
+]
+
+EUROPE_DIRECT = {
+    'programme': {
+        'regles': [
+            ('FEDER', ['feder', 'développement régional']),
+            ('FSE', ['fse', 'social']),
+            ('FEADER', ['feader', 'agricole']),
+            ('INTERREG', ['interreg', 'coopération'])
+        ],
+        'defaut': 'FEDER'
+    },
+    'secteur': {
+        'regles': [
+            ('Agriculture', ['agriculture', 'agri', 'rural']),
+            ('Tourisme', ['tourisme', 'touristique', 'hôtellerie', 'luxe']),
+            ('Recherche', ['recherche', 'innovation', 'numérique']),
+            ('Formation', ['formation', 'emploi', 'social']),
+            ('Environnement', ['environnement', 'énergie', 'durable', 'corail', 'eau']),
+            ('Transport', ['transport', 'mobilité', 'infrastructure', 'port'])
+        ],
+        'defaut': 'Développement régional'
+    }
+}
+
+REGION = {
+    'programme': {
+        'regles': [
+            ('FEDER', ['feder']),
+            ('FSE', ['fse']),
+            ('FEADER', ['feader']),
+            ('INTERREG', ['interreg'])
+        ],
+        'defaut': 'FEDER'
+    },
+    'secteur': {
+        'regles': [
+            ('Agriculture', ['agriculture', 'agri', 'rural', 'filière']),
+            ('Tourisme', ['tourisme', 'touristique', 'hôtellerie', 'restaurant', 'luxe']),
+            ('Formation', ['formation', 'emploi', 'compétence', 'insertion', 'éducation']),
+            ('Environnement', ['environnement', 'énergie', 'renouvelable', 'durable', 'corail', 'eau', 'décharge', 'déchets']),
+            ('Recherche', ['recherche', 'innovation', 'numérique', 'technologie']),
+            ('Transport', ['transport', 'mobilité', 'infrastructure', 'port', 'aéroport', 'route']),
+            ('Santé', ['santé', 'médical', 'social']),
+            ('Services', ['services', 'commerce', 'immobilier'])
+        ],
+        'defaut': 'Développement régional'
+    },
+    'commune': {
+        'regles': commune_rules(COMMUNES),
+        'defaut': 'Saint-Barthélemy'
+    }
+}
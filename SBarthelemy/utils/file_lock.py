@@ -0,0 +1,71 @@
+import os
+import re
+import time
+import unicodedata
+from contextlib import contextmanager
+from utils.http_cache import CACHE_DIR
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+LOCK_DIR = os.path.join(CACHE_DIR, 'locks')
+
+# Intervalle entre deux tentatives de prise d'un verrou occupé (en secondes)
+POLL_INTERVAL = 0.2
+
+class LockTimeout(Exception):
+    """Le verrou est resté occupé au-delà du délai d'attente"""
+
+@contextmanager
+def file_lock(*noms, timeout=None):
+    """Verrou exclusif partagé par les fils et les processus de la machine
+
+    `noms` désigne le verrou (ex. 'reunion', 'data.gouv.fr') ; il correspond
+    à un fichier sous LOCK_DIR, que tous les processus utilisant le même
+    cache partagent. Attend au plus `timeout` secondes (sans limite si None),
+    puis lève LockTimeout. Le système libère le verrou si le processus meurt.
+    """
+    path = os.path.join(LOCK_DIR, *[_slug(nom) for nom in noms]) + '.lock'
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not _try_lock(fd, bloquant=deadline is None):
+            if deadline is not None and time.monotonic() >= deadline:
+                raise LockTimeout(f"verrou {'/'.join(noms)} occupé depuis plus de {timeout}s")
+            time.sleep(POLL_INTERVAL)
+
+        try:
+            yield
+        finally:
+            _unlock(fd)
+    finally:
+        os.close(fd)
+
+def _try_lock(fd, bloquant=False):
+    # Chaque appel ouvre son propre descripteur : le verrou exclut aussi les autres fils du processus.
+    # Sans délai, l'attente est confiée au système (réveil dès la libération, sans scrutation)
+    try:
+        if fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX if bloquant else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+def _unlock(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+def _slug(nom):
+    ascii_nom = unicodedata.normalize('NFKD', nom).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '_', ascii_nom.lower()).strip('_')
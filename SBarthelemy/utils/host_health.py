@@ -0,0 +1,151 @@
+import os
+import json
+import time
+import threading
+import requests
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from utils.http_cache import CACHE_DIR
+from utils.file_lock import file_lock
+
+# État des hôtes partagé par tous les processus de la machine (refresh.py de chaque
+# territoire) : chaque mise à jour relit le fichier et n'y réécrit que son hôte
+HEALTH_PATH = os.path.join(CACHE_DIR, 'hosts.json')
+
+# Échecs consécutifs (erreur réseau, délai dépassé, 5xx) avant d'ouvrir le disjoncteur d'un hôte
+FAILURE_THRESHOLD = 3
+
+# Durée pendant laquelle un hôte en panne est court-circuité, avant une requête d'essai (en secondes)
+OPEN_DURATION = 60
+
+# Latences conservées par hôte, et nombre minimum avant d'adapter le délai d'attente
+LATENCY_WINDOW = 50
+MIN_SAMPLES = 5
+
+# Délai adaptatif : LATENCY_MARGIN fois le 95e centile, entre MIN_TIMEOUT
+# et MAX_TIMEOUT_FACTOR fois le délai demandé par l'appelant
+LATENCY_MARGIN = 4
+MIN_TIMEOUT = 2.0
+MAX_TIMEOUT_FACTOR = 2
+
+_lock = threading.Lock()
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Requête refusée sans accès réseau : l'hôte est considéré en panne"""
+
+def host_of(url):
+    return urlsplit(url).netloc.lower()
+
+def before_request(url, timeout):
+    """À appeler avant chaque requête : retourne le délai d'attente à utiliser
+
+    Lève CircuitOpenError si le disjoncteur de l'hôte est ouvert. Une fois
+    OPEN_DURATION écoulé, une seule requête d'essai est autorisée (semi-ouvert) :
+    son succès referme le disjoncteur, son échec le rouvre.
+    """
+    host = host_of(url)
+    with _shared_host(host) as state:
+        if state['etat'] == 'ouvert':
+            if time.time() - state['ouvert_depuis'] < OPEN_DURATION:
+                raise CircuitOpenError(f"{host} indisponible (disjoncteur ouvert), requête non envoyée")
+            state['etat'] = 'semi-ouvert'
+            state['essai_depuis'] = 0
+
+        if state['etat'] == 'semi-ouvert':
+            # Essai abandonné (processus arrêté) au-delà de OPEN_DURATION : un nouvel essai est permis
+            if time.time() - state.get('essai_depuis', 0) < OPEN_DURATION:
+                raise CircuitOpenError(f"{host} en cours de vérification, requête non envoyée")
+            state['essai_depuis'] = time.time()
+
+        return _adaptive_timeout(state, timeout)
+
+def record_success(url, latence):
+    """Enregistre une réponse de l'hôte (hors 5xx) et sa latence en secondes"""
+    host = host_of(url)
+    with _shared_host(host) as state:
+        state['etat'] = 'ferme'
+        state['echecs'] = 0
+        state['essai_depuis'] = 0
+        state['latences'] = (state['latences'] + [round(latence, 4)])[-LATENCY_WINDOW:]
+
+def record_failure(url):
+    """Enregistre un échec de l'hôte ; ouvre le disjoncteur au-delà du seuil"""
+    host = host_of(url)
+    with _shared_host(host) as state:
+        state['echecs'] += 1
+        state['essai_depuis'] = 0
+
+        if state['etat'] == 'semi-ouvert' or state['echecs'] >= FAILURE_THRESHOLD:
+            if state['etat'] != 'ouvert':
+                print(f"Disjoncteur ouvert pour {host} ({state['echecs']} échecs consécutifs)")
+            state['etat'] = 'ouvert'
+            state['ouvert_depuis'] = time.time()
+
+def host_report():
+    """État de chaque hôte : {hôte: {'etat', 'echecs', 'p50', 'p95'}} (latences en secondes)
+
+    Relit HEALTH_PATH à chaque appel : le tableau de bord n'interroge aucun
+    hôte lui-même, l'état est celui écrit par les processus de rafraîchissement.
+    """
+    hosts = _read_hosts()
+    return {
+        host: {
+            'etat': state['etat'],
+            'echecs': state['echecs'],
+            'p50': _percentile(state['latences'], 50),
+            'p95': _percentile(state['latences'], 95)
+        }
+        for host, state in hosts.items()
+    }
+
+def _adaptive_timeout(state, timeout):
+    if len(state['latences']) < MIN_SAMPLES:
+        return timeout
+
+    p95 = _percentile(state['latences'], 95)
+    return min(max(LATENCY_MARGIN * p95, MIN_TIMEOUT), MAX_TIMEOUT_FACTOR * timeout)
+
+def _percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+@contextmanager
+def _shared_host(host):
+    """État d'un hôte, relu puis réécrit sous verrou de fichier s'il a changé
+
+    Seul cet hôte est remplacé dans le fichier relu : les états écrits par
+    les autres processus entre-temps sont conservés.
+    """
+    with _lock, file_lock('hosts'):
+        hosts = _read_hosts()
+        state = hosts.get(host) or {
+            'etat': 'ferme',
+            'echecs': 0,
+            'ouvert_depuis': 0,
+            'essai_depuis': 0,
+            'latences': []
+        }
+        before = json.dumps(state, sort_keys=True)
+        yield state
+        if json.dumps(state, sort_keys=True) != before:
+            hosts[host] = state
+            _write_hosts(hosts)
+
+def _read_hosts():
+    try:
+        with open(HEALTH_PATH, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_hosts(hosts):
+    try:
+        os.makedirs(os.path.dirname(HEALTH_PATH), exist_ok=True)
+        tmp_path = f"{HEALTH_PATH}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(hosts, f)
+        os.replace(tmp_path, HEALTH_PATH)
+    except OSError as e:
+        print(f"État des hôtes non enregistré: {e}")
@@ -0,0 +1,55 @@
+import os
+import json
+import hashlib
+import threading
+from utils.http_cache import CACHE_DIR
+
+REGISTRY_PATH = os.path.join(CACHE_DIR, 'schemas.json')
+
+_registry_lock = threading.Lock()
+
+def header_fingerprint(header):
+    """Empreinte d'un en-tête (liste des noms de colonnes)"""
+    normalized = '\x1f'.join(str(colonne).strip().lower() for colonne in header)
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+
+def lookup_schema(source_url=None, fingerprint=None):
+    """Retrouve un schéma connu, d'abord par URL de ressource puis par empreinte d'en-tête"""
+    registry = _read_registry()
+
+    if source_url:
+        known = registry['by_url'].get(source_url)
+        if known and known in registry['schemas']:
+            return registry['schemas'][known]
+
+    if fingerprint:
+        return registry['schemas'].get(fingerprint)
+
+    return None
+
+def register_schema(schema, source_url=None):
+    """Enregistre un schéma détecté, indexé par son empreinte et par l'URL de la ressource"""
+    with _registry_lock:
+        registry = _read_registry()
+        registry['schemas'][schema['fingerprint']] = schema
+        if source_url:
+            registry['by_url'][source_url] = schema['fingerprint']
+        _write_registry(registry)
+
+def _read_registry():
+    try:
+        with open(REGISTRY_PATH, encoding='utf-8') as f:
+            registry = json.load(f)
+    except (OSError, ValueError):
+        registry = {}
+
+    registry.setdefault('by_url', {})
+    registry.setdefault('schemas', {})
+    return registry
+
+def _write_registry(registry):
+    os.makedirs(os.path.dirname(REGISTRY_PATH), exist_ok=True)
+    tmp_path = f"{REGISTRY_PATH}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(registry, f)
+    os.replace(tmp_path, REGISTRY_PATH)
@@ -0,0 +1,62 @@
+from utils.keyword_classifier import commune_rules
+
+# Taxonomies de classement des projets (Saint-Martin)
+# Chaque axe liste ses règles par ordre de priorité : la première règle dont un
+# mot-clé apparaît dans le texte l'emporte, sinon le libellé par défaut est utilisé.
+
+COMMUNES = [
+    'Marigot', 'Grand-Case', "Quartier d'Orléans", 'Lowlands', 'Simpson Bay'
+]
+
+EUROPE_DIRECT = {
+    'programme': {
+        'regles': [
+            ('FEDER', ['feder', 'développement régional']),
+            ('FSE', ['fse', 'social']),
+            ('FEADER', ['feader', 'agricole']),
+            ('INTERREG', ['interreg', 'coopération'])
+        ],
+        'defaut': 'FEDER'
+    },
+    'secteur': {
+        'regles': [
+            ('Agriculture', ['agriculture', 'agri', 'rural']),
+            ('Tourisme', ['tourisme', 'touristique', 'plage', 'hôtellerie']),
+            ('Recherche', ['recherche', 'innovation', 'numérique']),
+            ('Formation', ['formation', 'emploi', 'social']),
+            ('Environnement', ['environnement', 'énergie', 'durable', 'solaire', 'eau']),
+            ('Transport', ['transport', 'mobilité', 'infrastructure']),
+            ('Économie bleue', ['pêche', 'port', 'plongée'])
+        ],
+        'defaut': 'Développement régional'
+    }
+}
+
+REGION = {
+    'programme': {
+        'regles': [
+            ('FEDER', ['feder']),
+            ('FSE', ['fse']),
+            ('FEADER', ['feader']),
+            ('INTERREG', ['interreg'])
+        ],
+        'defaut': 'FEDER'
+    },
+    'secteur': {
+        'regles': [
+            ('Agriculture', ['agriculture', 'agri', 'rural', 'filière']),
+            ('Tourisme', ['tourisme', 'touristique', 'hôtellerie', 'plage', 'croisière']),
+            ('Formation', ['formation', 'emploi', 'compétence', 'insertion', 'éducation']),
+            ('Environnement', ['environnement', 'énergie', 'renouvelable', 'durable', 'solaire', 'eau', 'décharge']),
+            ('Recherche', ['recherche', 'innovation', 'numérique', 'technologie']),
+            ('Transport', ['transport', 'mobilité', 'infrastructure', 'port', 'route']),
+            ('Santé', ['santé', 'médical', 'social']),
+            ('Économie bleue', ['pêche', 'port', 'plongée', 'marine', 'économique bleue'])
+        ],
+        'defaut': 'Développement régional'
+    },
+    'commune': {
+        'regles': commune_rules(COMMUNES, separators="-'"),
+        'defaut': 'Saint-Martin'
+    }
+}
@@ -0,0 +1,62 @@
+def commune_rules(communes, separators='-'):
+    """Règles de commune : chaque commune est cherchée en minuscules, `separators` remplacés par des espaces"""
+    rules = []
+    for commune in communes:
+        keyword = commune.lower()
+        for separator in separators:
+            keyword = keyword.replace(separator, ' ')
+        rules.append((commune, [keyword]))
+    return rules
+
+def compile_taxonomy(taxonomy):
+    """Compile une taxonomie déclarative en un classifieur réutilisable
+
+    `taxonomy` associe à chaque axe (programme, secteur, commune...) un dict
+    {'regles': [(libellé, [mots-clés]), ...], 'defaut': libellé}. Les règles
+    sont essayées dans l'ordre, comme une suite de if/elif : la première dont
+    un mot-clé apparaît (en sous-chaîne) dans le texte l'emporte.
+
+    Chaque mot-clé distinct reçoit un indice : un mot-clé partagé par
+    plusieurs axes ('social' pour le programme FSE et un secteur, 'port'
+    pour deux secteurs...) n'est cherché qu'une fois par texte.
+    """
+    index = {}
+    axes = []
+
+    for axe, spec in taxonomy.items():
+        rules = []
+        for label, keywords in spec['regles']:
+            ids = tuple(index.setdefault(keyword.lower(), len(index)) for keyword in keywords)
+            rules.append((label, ids))
+        axes.append((axe, rules, spec['defaut']))
+
+    return {'keywords': list(index), 'axes': axes}
+
+def classify(text, classifieur):
+    """Classe un texte sur tous les axes de la taxonomie
+
+    Le texte n'est mis en minuscules qu'une fois ; chaque mot-clé est cherché
+    au plus une fois, et seulement si une règle prioritaire n'a pas déjà
+    tranché pour son axe. Retourne un dict {axe: libellé}, avec le libellé par
+    défaut des axes sans aucun mot-clé trouvé.
+    """
+    text_lower = text.lower()
+    keywords = classifieur['keywords']
+    present = [None] * len(keywords)
+    result = {}
+
+    for axe, rules, defaut in classifieur['axes']:
+        result[axe] = defaut
+        for label, ids in rules:
+            for i in ids:
+                found = present[i]
+                if found is None:
+                    found = present[i] = keywords[i] in text_lower
+                if found:
+                    break
+            else:
+                continue
+            result[axe] = label
+            break
+
+    return result
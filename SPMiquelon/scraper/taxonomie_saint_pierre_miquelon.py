@@ -0,0 +1,64 @@
+from utils.keyword_classifier import commune_rules
+
+# Taxonomies de classement des projets (Saint-Pierre et Miquelon)
+# Chaque axe liste ses règles par ordre de priorité : la première règle dont un
+# mot-clé apparaît dans le texte l'emporte, sinon le libellé par défaut est utilisé.
+
+COMMUNES = [
+    'Saint-Pierre', 'Miquelon', 'Langlade'
+]
+
+EUROPE_DIRECT = {
+    'programme': {
+        'regles': [
+            ('FEDER', ['feder', 'développement régional']),
+            ('FSE', ['fse', 'social']),
+            ('FEADER', ['feader', 'agricole']),
+            ('INTERREG', ['interreg', 'coopération'])
+        ],
+        'defaut': 'FEDER'
+    },
+    'secteur': {
+        'regles': [
+            ('Agriculture', ['agriculture', 'agri', 'rural']),
+            ('Tourisme', ['tourisme', 'touristique']),
+            ('Recherche', ['recherche', 'innovation', 'numérique']),
+            ('Formation', ['formation', 'emploi', 'social']),
+            ('Environnement', ['environnement', 'énergie', 'durable', 'éolien']),
+            ('Transport', ['transport', 'mobilité', 'infrastructure']),
+            ('Pêche', ['pêche', 'thon', 'homard', 'crabe'])
+        ],
+        'defaut': 'Développement régional'
+    }
+}
+
+REGION = {
+    'programme': {
+        'regles': [
+            ('FEDER', ['feder']),
+            ('FSE', ['fse']),
+            ('FEADER', ['feader']),
+            ('INTERREG', ['interreg'])
+        ],
+        'defaut': 'FEDER'
+    },
+    'secteur': {
+        'regles': [
+            ('Agriculture', ['agriculture', 'agri', 'rural', 'filière', 'serre']),
+            ('Tourisme', ['tourisme', 'touristique', 'hôtellerie', 'hivernal']),
+            ('Formation', ['formation', 'emploi', 'compétence', 'insertion', 'éducation']),
+            ('Environnement', ['environnement', 'énergie', 'renouvelable', 'durable', 'éolien', 'déchets']),
+            ('Recherche', ['recherche', 'innovation', 'numérique', 'technologie']),
+            ('Transport', ['transport', 'mobilité', 'infrastructure', 'port', 'aéroport', 'route']),
+            ('Santé', ['santé', 'médical', 'social']),
+            ('Pêche', ['pêche', 'port', 'aquaculture', 'thon', 'homard', 'crabe', 'usine']),
+            ('Numérique', ['connectivité', 'internet', 'fibre', 'numérique']),
+            ('Énergie', ['éolien', 'énergie', 'autonomie', 'isolation', 'panneau'])
+        ],
+        'defaut': 'Développement régional'
+    },
+    'commune': {
+        'regles': commune_rules(COMMUNES),
+        'defaut': 'Saint-Pierre et Miquelon'
+    }
+}
@@ -0,0 +1,119 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from utils.http_session import http_get, bytes_received
+
+# Taille de page maximale acceptée par l'API data.gouv.fr
+PAGE_SIZE = 100
+
+# Requêtes simultanées vers data.gouv.fr (inférieur au pool de connexions par hôte)
+MAX_WORKERS = 4
+
+RESOURCE_FORMATS = ['csv', 'xls', 'xlsx']
+
+def crawl_catalog(search_url, page_size=PAGE_SIZE, max_workers=MAX_WORKERS):
+    """Parcourt toutes les pages de résultats d'une recherche /api/1/datasets/
+
+    La première page donne le nombre total de résultats ; les pages suivantes
+    sont ensuite récupérées en parallèle. Retourne (datasets, stats).
+    """
+    stats = new_stats()
+
+    first_page = _fetch_page(search_url, 1, page_size)
+    datasets = list(first_page.get('data', []))
+
+    total = first_page.get('total', len(datasets))
+    page_count = max(1, -(-total // page_size))
+
+    if page_count > 1:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="catalog") as executor:
+            pages = executor.map(lambda page: _fetch_page(search_url, page, page_size), range(2, page_count + 1))
+            for page in pages:
+                datasets.extend(page.get('data', []))
+
+    stats['pages'] = page_count
+    stats['datasets'] = len(datasets)
+
+    return datasets, stats
+
+def unique_resources(datasets, formats=RESOURCE_FORMATS):
+    """Liste les ressources tabulaires des jeux de données, sans doublon d'URL
+
+    Retourne des tuples (resource, dataset) ; une ressource présente dans
+    plusieurs jeux de données n'est gardée qu'une fois (premier jeu rencontré).
+    """
+    seen = set()
+    resources = []
+
+    for dataset in datasets:
+        for resource in dataset.get('resources', []):
+            url = resource.get('url')
+            if not url or resource_format(resource) not in formats or url in seen:
+                continue
+            seen.add(url)
+            resources.append((resource, dataset))
+
+    return resources
+
+def resource_format(resource):
+    """Format d'une ressource en minuscules ('csv', 'xlsx'...)
+
+    Le champ 'format' du catalogue fait foi : les URL stables de data.gouv.fr
+    (/fr/datasets/r/<uuid>) n'ont pas d'extension. L'extension de l'URL ne
+    sert qu'à défaut de format déclaré.
+    """
+    declare = (resource.get('format') or '').strip().lower()
+    if declare:
+        return declare
+    return os.path.splitext(urlsplit(resource.get('url') or '').path)[1].lstrip('.').lower()
+
+def process_resources(resources, fonction, stats, max_workers=MAX_WORKERS):
+    """Applique `fonction(resource, dataset)` à chaque ressource en parallèle
+
+    Les erreurs d'une ressource sont journalisées sans interrompre les autres.
+    Générateur : les résultats non vides sont produits dans l'ordre des
+    ressources, chacun dès qu'il est prêt, sans attendre les suivants.
+    """
+    def run(item):
+        resource, dataset = item
+        try:
+            return fonction(resource, dataset)
+        except Exception as e:
+            print(f"Erreur traitement ressource {resource.get('url')}: {e}")
+            return None
+
+    stats['resources'] = len(resources)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="resource") as executor:
+        for result in executor.map(run, resources):
+            if result is not None:
+                yield result
+
+def new_stats():
+    """Compteurs d'une exploration du catalogue"""
+    return {
+        'pages': 0,
+        'datasets': 0,
+        'resources': 0,
+        'start': time.monotonic(),
+        'start_bytes': bytes_received()
+    }
+
+def format_stats(stats):
+    """Résumé lisible du débit d'une exploration"""
+    duree = max(time.monotonic() - stats['start'], 1e-6)
+    megaoctets = (bytes_received() - stats['start_bytes']) / 1e6
+
+    return (
+        f"{stats['datasets']} jeux de données ({stats['pages']} pages), "
+        f"{stats['resources']} ressources, {megaoctets:.1f} Mo en {duree:.1f} s "
+        f"- {stats['datasets'] / duree:.1f} jeux/s, {megaoctets / duree:.2f} Mo/s"
+    )
+
+def _fetch_page(search_url, page, page_size):
+    """Récupère une page de résultats de l'API"""
+    separator = '&' if '?' in search_url else '?'
+    response = http_get(f"{search_url}{separator}page={page}&page_size={page_size}", timeout=10)
+    response.raise_for_status()
+    return response.json()
@@ -0,0 +1,139 @@
+import re
+from bs4 import BeautifulSoup, SoupStrainer
+
+def find_candidate_blocks(content, tags, class_pattern, mode='all', contains=None, containing_tags=None):
+    """Parse une page en ne construisant l'arbre que pour les blocs candidats
+
+    Utilise le parseur lxml et un SoupStrainer limité aux éléments `tags` dont
+    la classe correspond à `class_pattern` (et à leurs descendants) ; le reste
+    de la page n'est jamais matérialisé. Retourne les blocs dans l'ordre du
+    document, comme soup.find_all(tags, class_=...) sur la page complète.
+
+    `mode` filtre les blocs imbriqués les uns dans les autres :
+    'all' les garde tous, 'outermost' ne garde que les plus externes et
+    'innermost' que ceux qui ne contiennent aucun autre bloc candidat, et
+    'items' les plus externes parmi ceux qui ne regroupent pas plusieurs
+    blocs candidats (une liste d'actualités dont la classe correspond au
+    motif n'absorbe pas ses articles). Ces trois modes donnent des blocs
+    disjoints, dont chaque nœud texte n'est donc lu qu'une fois par get_text().
+
+    Si `contains` est donné, seuls les blocs dont le texte contient cette
+    chaîne sont retenus, avant le filtrage par `mode` ; de même pour
+    `containing_tags`, qui exige au moins un de ces éléments (titre...) dans
+    le bloc. Un bloc interne sans montant ou sans titre (étiquette, montant
+    isolé) ne masque alors plus la carte qui l'englobe.
+    """
+    class_regex = re.compile(class_pattern)
+    strainer = SoupStrainer(tags, class_=class_regex)
+
+    soup = BeautifulSoup(content, 'lxml', parse_only=strainer)
+    blocks = soup.find_all(tags, class_=class_regex)
+    if contains is not None:
+        blocks = blocks_containing(soup, blocks, contains)
+    if containing_tags is not None:
+        blocks = _blocks_above(blocks, soup.find_all(containing_tags))
+
+    if mode == 'outermost':
+        return outermost_blocks(blocks)
+    if mode == 'innermost':
+        return innermost_blocks(blocks)
+    if mode == 'items':
+        return item_blocks(blocks)
+    return blocks
+
+def blocks_containing(soup, blocks, text):
+    """Blocs dont le texte contient `text` (ordre du document conservé)
+
+    Part des nœuds texte qui contiennent `text` et marque leurs ancêtres, sans
+    reconstruire le texte de chaque bloc.
+    """
+    return _blocks_above(blocks, soup.find_all(string=re.compile(re.escape(text))))
+
+def _blocks_above(blocks, nodes):
+    # Blocs ayant au moins un de ces nœuds parmi leurs descendants
+    marked = set()
+
+    for node in nodes:
+        # On s'arrête dès qu'un ancêtre est déjà marqué
+        parent = node.parent
+        while parent is not None and id(parent) not in marked:
+            marked.add(id(parent))
+            parent = parent.parent
+
+    return [block for block in blocks if id(block) in marked]
+
+def outermost_blocks(blocks):
+    """Blocs sans bloc candidat parmi leurs ancêtres (ordre du document conservé)
+
+    Chaque élément de l'arbre n'est examiné qu'une fois, même pour des
+    imbrications très profondes.
+    """
+    candidates = {id(block) for block in blocks}
+    covered = {}
+
+    def is_covered(element):
+        # Remonte jusqu'au premier ancêtre déjà connu, puis mémorise le chemin
+        path = []
+        while element is not None and id(element) not in covered:
+            path.append(element)
+            element = element.parent
+        state = covered[id(element)] if element is not None else False
+        for node in reversed(path):
+            state = state or id(node) in candidates
+            covered[id(node)] = state
+        return state
+
+    return [block for block in blocks if not is_covered(block.parent)]
+
+def innermost_blocks(blocks):
+    """Blocs ne contenant aucun autre bloc candidat (ordre du document conservé)"""
+    has_candidate_below = set()
+
+    for block in blocks:
+        # Marque les ancêtres ; on s'arrête dès qu'un ancêtre est déjà marqué
+        parent = block.parent
+        while parent is not None and id(parent) not in has_candidate_below:
+            has_candidate_below.add(id(parent))
+            parent = parent.parent
+
+    return [block for block in blocks if id(block) not in has_candidate_below]
+
+def item_blocks(blocks):
+    """Blocs les plus externes parmi ceux qui ne regroupent pas plusieurs blocs candidats
+
+    Un bloc dont les blocs candidats les plus proches en dessous sont au moins
+    deux est une liste : il est écarté, ainsi que les blocs qui l'englobent,
+    et ce sont les éléments de la liste qui sont gardés.
+    """
+    candidates = {id(block): block for block in blocks}
+    nearest = {}
+
+    def nearest_candidate(element):
+        # Premier bloc candidat parmi l'élément et ses ancêtres, chemin mémorisé
+        path = []
+        while element is not None and id(element) not in nearest:
+            path.append(element)
+            element = element.parent
+        found = nearest[id(element)] if element is not None else None
+        for node in reversed(path):
+            if id(node) in candidates:
+                found = id(node)
+            nearest[id(node)] = found
+        return found
+
+    children = {}
+    for block in blocks:
+        parent = nearest_candidate(block.parent)
+        children[parent] = children.get(parent, 0) + 1
+
+    lists = set()
+    for key, count in children.items():
+        if key is None or count < 2:
+            continue
+        # Marque la liste et ses ancêtres ; on s'arrête dès qu'un ancêtre est déjà marqué
+        element = candidates[key]
+        while element is not None and id(element) not in lists:
+            lists.add(id(element))
+            element = element.parent
+
+    return outermost_blocks([block for block in blocks if id(block) not in lists])
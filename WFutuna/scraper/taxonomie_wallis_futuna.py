@@ -0,0 +1,65 @@
+from utils.keyword_classifier import commune_rules
+
+# Taxonomies de classement des projets (Wallis et Futuna)
+# Chaque axe liste ses règles par ordre de priorité : la première règle dont un
+# mot-clé apparaît dans le texte l'emporte, sinon le libellé par défaut est utilisé.
+
+COMMUNES = [
+    'Mata-Utu', 'Sigave', 'Leava', "Mala'efo'ou", 'Vaitupu'
+]
+
+EUROPE_DIRECT = {
+    'programme': {
+        'regles': [
+            ('FEDER', ['feder', 'développement régional']),
+            ('FSE', ['fse', 'social']),
+            ('FEADER', ['feader', 'agricole']),
+            ('INTERREG', ['interreg', 'coopération'])
+        ],
+        'defaut': 'FEDER'
+    },
+    'secteur': {
+        'regles': [
+            ('Agriculture', ['agriculture', 'agri', 'rural']),
+            ('Tourisme', ['tourisme', 'touristique']),
+            ('Recherche', ['recherche', 'innovation', 'numérique']),
+            ('Formation', ['formation', 'emploi', 'social']),
+            ('Environnement', ['environnement', 'énergie', 'durable', 'solaire']),
+            ('Transport', ['transport', 'mobilité', 'infrastructure']),
+            ('Pêche', ['pêche', 'port', 'aquaculture']),
+            ('Numérique', ['connectivité', 'internet', 'fibre'])
+        ],
+        'defaut': 'Développement régional'
+    }
+}
+
+REGION = {
+    'programme': {
+        'regles': [
+            ('FEDER', ['feder']),
+            ('FSE', ['fse']),
+            ('FEADER', ['feader']),
+            ('INTERREG', ['interreg'])
+        ],
+        'defaut': 'FEDER'
+    },
+    'secteur': {
+        'regles': [
+            ('Agriculture', ['agriculture', 'agri', 'rural', 'filière']),
+            ('Tourisme', ['tourisme', 'touristique', 'hôtellerie']),
+            ('Formation', ['formation', 'emploi', 'compétence', 'insertion', 'éducation']),
+            ('Environnement', ['environnement', 'énergie', 'renouvelable', 'durable', 'solaire', 'déchets']),
+            ('Recherche', ['recherche', 'innovation', 'numérique', 'technologie']),
+            ('Transport', ['transport', 'mobilité', 'infrastructure', 'port', 'aéroport', 'route']),
+            ('Santé', ['santé', 'médical', 'social']),
+            ('Pêche', ['pêche', 'port', 'aquaculture', 'thon']),
+            ('Numérique', ['connectivité', 'internet', 'fibre', 'numérique']),
+            ('Énergie', ['solaire', 'énergie', 'autonomie', 'panneau'])
+        ],
+        'defaut': 'Développement régional'
+    },
+    'commune': {
+        'regles': commune_rules(COMMUNES, separators="-'"),
+        'defaut': 'Wallis et Futuna'
+    }
+}
@@ -0,0 +1,157 @@
+import os
+import time
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from utils import http_cache
+from utils import host_health
+from utils import rate_limit
+
+# Nombre d'hôtes distincts dont le pool de connexions est conservé
+POOL_CONNECTIONS = 16
+
+# Connexions simultanées maximum par hôte (les requêtes suivantes attendent)
+POOL_MAXSIZE = 6
+
+DEFAULT_TIMEOUT = 10
+
+_session = None
+_session_lock = threading.Lock()
+
+# Octets reçus depuis le démarrage du processus (pour les mesures de débit)
+_bytes_received = 0
+_bytes_lock = threading.Lock()
+
+def get_session():
+    """Retourne la session HTTP partagée (keep-alive et réutilisation TLS)"""
+    global _session
+
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _create_session()
+
+    return _session
+
+def _create_session():
+    """Crée une session avec un pool de connexions borné par hôte"""
+    session = requests.Session()
+
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        pool_block=True
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+
+    return session
+
+def bytes_received():
+    """Nombre total d'octets de corps HTTP reçus par ce processus"""
+    return _bytes_received
+
+def _count_bytes(n):
+    global _bytes_received
+    with _bytes_lock:
+        _bytes_received += n
+
+def _send(url, timeout, **kwargs):
+    """GET via la session partagée, derrière le disjoncteur et le limiteur de débit de l'hôte
+
+    Un hôte en panne est refusé immédiatement (host_health.CircuitOpenError) ;
+    sinon le délai d'attente s'adapte aux latences observées pour cet hôte.
+    Les erreurs réseau et les statuts transitoires (429, 502, 503, 504) sont
+    réessayés avec backoff exponentiel et gigue, en respectant Retry-After.
+    """
+    attempt = 0
+
+    while True:
+        request_timeout = host_health.before_request(url, timeout)
+        rate_limit.acquire(url)
+
+        try:
+            response = get_session().get(url, timeout=request_timeout, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            host_health.record_failure(url)
+            delay = rate_limit.retry_delay(attempt)
+            if delay is None:
+                raise
+        except requests.exceptions.RequestException:
+            host_health.record_failure(url)
+            raise
+        else:
+            if response.status_code >= 500:
+                host_health.record_failure(url)
+            else:
+                host_health.record_success(url, response.elapsed.total_seconds())
+
+            if response.status_code not in rate_limit.RETRY_STATUSES:
+                rate_limit.speed_up(url)
+                return response
+
+            rate_limit.slow_down(url, rate_limit.parse_retry_after(response))
+            delay = rate_limit.retry_delay(attempt, response)
+            if delay is None:
+                return response
+            response.close()
+
+        attempt += 1
+        time.sleep(delay)
+
+def http_get(url, timeout=DEFAULT_TIMEOUT, use_cache=True, **kwargs):
+    """Effectue un GET via la session partagée, revalidé contre le cache disque
+
+    Si une version en cache existe, la requête est conditionnelle
+    (If-None-Match / If-Modified-Since) et un 304 renvoie le corps en cache.
+    """
+    if not use_cache or 'params' in kwargs:
+        response = _send(url, timeout, **kwargs)
+        _count_bytes(len(response.content))
+        return response
+
+    entry = http_cache.load_entry(url)
+
+    headers = dict(kwargs.pop('headers', None) or {})
+    headers.update(http_cache.conditional_headers(entry))
+
+    response = _send(url, timeout, headers=headers, **kwargs)
+
+    if response.status_code == 304 and entry:
+        cached = http_cache.cached_response(url, entry)
+        if cached is not None:
+            return cached
+        # Corps en cache perdu : refaire une requête complète
+        headers.pop('If-None-Match', None)
+        headers.pop('If-Modified-Since', None)
+        response = _send(url, timeout, headers=headers, **kwargs)
+
+    _count_bytes(len(response.content))
+
+    try:
+        http_cache.store_response(url, response)
+    except OSError as e:
+        print(f"Cache HTTP indisponible pour {url}: {e}")
+
+    return response
+
+def download_to_file(url, timeout=30, **kwargs):
+    """Télécharge une ressource en flux vers le cache disque et retourne le chemin du fichier
+
+    Le corps n'est jamais chargé entièrement en mémoire ; si la copie en cache
+    est toujours valide (304), aucun octet n'est retransféré.
+    """
+    entry = http_cache.load_entry(url)
+    cached_path = http_cache.cached_body_path(url)
+
+    headers = dict(kwargs.pop('headers', None) or {})
+    if os.path.exists(cached_path):
+        headers.update(http_cache.conditional_headers(entry))
+
+    with _send(url, timeout, headers=headers, stream=True, **kwargs) as response:
+        if response.status_code == 304 and entry and os.path.exists(cached_path):
+            http_cache.touch_entry(url, entry)
+            return cached_path
+
+        response.raise_for_status()
+        return http_cache.store_stream(url, response, on_chunk=_count_bytes)
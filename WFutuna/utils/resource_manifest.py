@@ -0,0 +1,105 @@
+import os
+import json
+import hashlib
+import threading
+import pandas as pd
+from utils.http_cache import CACHE_DIR
+
+MANIFEST_DIR = os.path.join(CACHE_DIR, 'manifest')
+
+# À incrémenter quand le traitement des ressources change : les sorties en cache sont alors ignorées
+PARSER_VERSION = 7
+
+_manifest_lock = threading.Lock()
+
+def resource_fingerprint(resource, dataset_title):
+    """Empreinte d'une ressource d'après les métadonnées du catalogue
+
+    Retourne None si le catalogue ne fournit ni somme de contrôle ni date de
+    modification : la ressource ne peut alors pas être déclarée inchangée.
+    """
+    checksum = resource.get('checksum') or {}
+    if isinstance(checksum, dict):
+        checksum = checksum.get('value')
+    last_modified = resource.get('last_modified')
+
+    if not checksum and not last_modified:
+        return None
+
+    return {
+        'checksum': checksum,
+        'last_modified': last_modified,
+        'dataset_title': dataset_title,
+        'parser_version': PARSER_VERSION
+    }
+
+def load_parsed_resource(namespace, resource, dataset_title):
+    """Relit la sortie déjà traitée d'une ressource inchangée, sans accès réseau
+
+    Retourne (trouvé, DataFrame ou None).
+    """
+    fingerprint = resource_fingerprint(resource, dataset_title)
+    if fingerprint is None:
+        return False, None
+
+    entry = _read_manifest(namespace).get(resource['url'])
+    if not entry or entry.get('fingerprint') != fingerprint:
+        return False, None
+
+    if entry.get('rows', 0) == 0:
+        return True, None
+
+    try:
+        return True, pd.read_pickle(entry['path'])
+    except (OSError, ValueError, KeyError) as e:
+        print(f"Sortie en cache illisible pour {resource['url']}: {e}")
+        return False, None
+
+def store_parsed_resource(namespace, resource, dataset_title, df):
+    """Enregistre la sortie traitée d'une ressource et met à jour le manifeste"""
+    fingerprint = resource_fingerprint(resource, dataset_title)
+    if fingerprint is None:
+        return
+
+    rows = 0 if df is None else len(df)
+    path = None
+
+    if rows:
+        key = hashlib.sha256(resource['url'].encode('utf-8')).hexdigest()
+        path = os.path.join(MANIFEST_DIR, namespace, f"{key}.pkl")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        df.to_pickle(tmp_path)
+        os.replace(tmp_path, path)
+
+    with _manifest_lock:
+        manifest = _read_manifest(namespace)
+        manifest[resource['url']] = {
+            'fingerprint': fingerprint,
+            'rows': rows,
+            'path': path
+        }
+        _write_manifest(namespace, manifest)
+
+def clear_manifest(namespace):
+    """Oublie toutes les ressources d'un territoire (force un nouveau téléchargement)"""
+    with _manifest_lock:
+        _write_manifest(namespace, {})
+
+def _manifest_path(namespace):
+    return os.path.join(MANIFEST_DIR, f"{namespace}.json")
+
+def _read_manifest(namespace):
+    try:
+        with open(_manifest_path(namespace), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_manifest(namespace, manifest):
+    path = _manifest_path(namespace)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f)
+    os.replace(tmp_path, path)
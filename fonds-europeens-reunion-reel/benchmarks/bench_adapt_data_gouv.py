@@ -0,0 +1,109 @@
+"""Benchmark de adapt_data_gouv_structure : ancienne boucle iterrows contre version par colonnes
+
+Utilisation (depuis le dossier du projet) :
+    python -m benchmarks.bench_adapt_data_gouv
+    python -m benchmarks.bench_adapt_data_gouv --sizes 10000 100000 1000000 --skip-legacy-above 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper.data_gouv import adapt_data_gouv_structure
+
+def legacy_adapt_data_gouv_structure(df, dataset_title):
+    """Implémentation d'origine (une itération Python par ligne), conservée pour comparaison"""
+
+    data = []
+    colonnes = df.columns.tolist()
+
+    col_mapping = {
+        'programme': next((c for c in colonnes if 'programme' in c.lower()), None),
+        'montant': next((c for c in colonnes if any(word in c.lower() for word in ['montant', 'budget', 'financement'])), None),
+        'beneficiaire': next((c for c in colonnes if 'beneficiaire' in c.lower()), None),
+        'secteur': next((c for c in colonnes if any(word in c.lower() for word in ['secteur', 'domaine', 'theme'])), None),
+    }
+
+    for _, row in df.iterrows():
+        try:
+            programme = str(row[col_mapping['programme']]) if col_mapping['programme'] else 'FEDER'
+            montant_str = str(row[col_mapping['montant']]) if col_mapping['montant'] else '0'
+            montant = float(montant_str.replace('€', '').replace(',', '.').strip()) if montant_str.replace('.', '').isdigit() else 100000
+
+            if montant <= 0:
+                continue
+
+            data.append({
+                'id': f"DG_{hash(str(row)) % 10000:04d}",
+                'titre': f"Projet {dataset_title}",
+                'programme': programme,
+                'secteur': str(row[col_mapping['secteur']]) if col_mapping['secteur'] else 'Développement régional',
+                'montant_total': montant,
+                'montant_paye': montant * 0.8,
+                'statut': 'En cours',
+                'taux_realisation': 80,
+                'beneficiaire': str(row[col_mapping['beneficiaire']]) if col_mapping['beneficiaire'] else 'Bénéficiaire',
+                'date_debut': '2023-01-01',
+                'date_fin_prevue': '2025-12-31',
+                'commune': 'La Réunion',
+                'source': f"data.gouv.fr - {dataset_title}"
+            })
+        except Exception:
+            continue
+
+    return data
+
+def make_operations_file(n_rows, seed=0):
+    """Génère un fichier « liste des opérations » synthétique de n_rows lignes"""
+    rng = np.random.default_rng(seed)
+
+    montants = rng.integers(1000, 5_000_000, size=n_rows).astype(str).astype(object)
+    # Quelques montants au format texte non numérique, comme dans les vrais fichiers
+    montants[rng.random(n_rows) < 0.05] = '1 234,56 €'
+
+    return pd.DataFrame({
+        'Programme opérationnel': rng.choice(['FEDER', 'FSE', 'FEADER', 'INTERREG'], size=n_rows),
+        'Nom du beneficiaire': [f"Bénéficiaire {i}" for i in range(n_rows)],
+        'Theme': rng.choice(['Recherche', 'Transport', 'Formation', 'Environnement'], size=n_rows),
+        'Montant UE programmé': montants,
+        'Commune': rng.choice(['Saint-Denis', 'Saint-Pierre', 'Le Tampon'], size=n_rows),
+        'Date de début': '2022-01-01',
+    })
+
+def timed(fonction, *args):
+    start = time.perf_counter()
+    result = fonction(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--skip-legacy-above', type=int, default=None,
+                        help="ne pas mesurer la boucle iterrows au-delà de ce nombre de lignes")
+    args = parser.parse_args()
+
+    print(f"{'lignes':>10} | {'iterrows (s)':>12} | {'colonnes (s)':>12} | {'gain':>7}")
+    print('-' * 52)
+
+    for n_rows in args.sizes:
+        df = make_operations_file(n_rows)
+
+        vectorized, t_vectorized = timed(adapt_data_gouv_structure, df, 'Benchmark')
+
+        if args.skip_legacy_above is not None and n_rows > args.skip_legacy_above:
+            print(f"{n_rows:>10} | {'-':>12} | {t_vectorized:>12.3f} | {'-':>7}")
+            continue
+
+        legacy, t_legacy = timed(legacy_adapt_data_gouv_structure, df, 'Benchmark')
+        assert len(legacy) == len(vectorized)
+        assert np.isclose(sum(r['montant_total'] for r in legacy), vectorized['montant_total'].sum())
+
+        print(f"{n_rows:>10} | {t_legacy:>12.3f} | {t_vectorized:>12.3f} | {t_legacy / t_vectorized:>6.0f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark du parsing HTML : page complète (html.parser) contre lxml + SoupStrainer
+
+Utilisation (depuis le dossier du projet) :
+    python -m benchmarks.bench_html_parsing --pages chemin/vers/pages_sauvegardees
+    python -m benchmarks.bench_html_parsing            # pages synthétiques
+
+Le dossier --pages contient les copies HTML des pages des 11 territoires
+(Europe Direct et Région), par exemple enregistrées avec
+`curl -o europe_direct_reunion.html https://europe-reunion.eu/les-fonds-europeens/`.
+"""
+
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+import tracemalloc
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.html_parsing import find_candidate_blocks
+
+# Sélecteurs utilisés par les scrapers
+SELECTEURS = {
+    'europe_direct': ('div', r'project|fond|programme'),
+    'region': (['article', 'div'], r'actualite|project|news'),
+}
+
+def legacy_find_blocks(content, tags, class_pattern):
+    """Parsing d'origine : arbre complet avec html.parser, puis find_all"""
+    soup = BeautifulSoup(content, 'html.parser')
+    return soup.find_all(tags, class_=re.compile(class_pattern))
+
+def make_synthetic_page(n_blocks=40, filler=3000):
+    """Page de type WordPress : menus, widgets et beaucoup de contenu hors blocs projets"""
+    parts = ['<html><head><title>Fonds européens</title>']
+    parts += [f'<link rel="stylesheet" href="/style{i}.css"><script>var x{i} = {i};</script>' for i in range(30)]
+    parts.append('</head><body><header><nav><ul>')
+    parts += [f'<li class="menu-item"><a href="/page{i}">Page {i}</a></li>' for i in range(200)]
+    parts.append('</ul></nav></header><main>')
+
+    for i in range(n_blocks):
+        parts.append(
+            f'<article class="actualite post-{i}"><div class="project-card"><h3>Projet {i}</h3>'
+            f'<p>Financement FEDER de {i + 1} 250 000 € pour la commune de Saint-Pierre.</p></div></article>'
+        )
+        parts += [f'<div class="widget"><span>Contenu annexe {i}-{j}</span><p>Lorem ipsum dolor sit amet.</p></div>'
+                  for j in range(filler // n_blocks)]
+
+    parts.append('</main><footer>' + '<p>Mentions légales</p>' * 100 + '</footer></body></html>')
+    return ''.join(parts).encode('utf-8')
+
+def measure(fonction, content, tags, class_pattern, repeat):
+    """Durée moyenne et pic mémoire d'une fonction de parsing"""
+    tracemalloc.start()
+    blocks = fonction(content, tags, class_pattern)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fonction(content, tags, class_pattern)
+    duree = (time.perf_counter() - start) / repeat
+
+    return blocks, duree, peak
+
+def load_pages(directory):
+    """Pages sauvegardées : (nom, contenu, sélecteur) d'après le nom de fichier"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, '*.htm*'))):
+        nom = os.path.basename(path)
+        selecteur = 'europe_direct' if 'europe' in nom.lower() else 'region'
+        with open(path, 'rb') as f:
+            pages.append((nom, f.read(), selecteur))
+    return pages
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--pages', help="dossier de pages HTML sauvegardées")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    if args.pages:
+        pages = load_pages(args.pages)
+    else:
+        pages = [(f'synthetique_{selecteur}', make_synthetic_page(), selecteur) for selecteur in SELECTEURS]
+
+    print(f"{'page':<40} | {'blocs':>5} | {'html.parser':>11} | {'lxml+strainer':>13} | {'mémoire (Mo)':>15}")
+    print('-' * 98)
+
+    for nom, content, selecteur in pages:
+        tags, class_pattern = SELECTEURS[selecteur]
+
+        legacy, t_legacy, m_legacy = measure(legacy_find_blocks, content, tags, class_pattern, args.repeat)
+        strained, t_strained, m_strained = measure(find_candidate_blocks, content, tags, class_pattern, args.repeat)
+
+        if len(legacy) != len(strained):
+            print(f"  ! {nom}: {len(legacy)} blocs en parsing complet contre {len(strained)} avec le strainer")
+
+        print(
+            f"{nom:<40} | {len(strained):>5} | {t_legacy * 1000:>9.1f}ms | {t_strained * 1000:>11.1f}ms | "
+            f"{m_legacy / 1e6:>6.1f} -> {m_strained / 1e6:>5.1f}"
+        )
+
+if __name__ == '__main__':
+    main()
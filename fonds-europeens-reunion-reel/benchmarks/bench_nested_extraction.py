@@ -0,0 +1,58 @@
+"""Benchmark de régression : extraction sur des blocs candidats profondément imbriqués
+
+Utilisation (depuis le dossier du projet) :
+    python -m benchmarks.bench_nested_extraction
+    python -m benchmarks.bench_nested_extraction --depths 250 500 1000 2000
+
+Chaque page contient une pile de div imbriquées dont toutes les classes
+correspondent au motif de scrape_europe_direct. En mode 'all', chaque bloc
+reconstruit le texte de tout son sous-arbre (coût quadratique) ; les modes
+'outermost', 'innermost' et 'items' ne gardent que des blocs disjoints.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scraper.europe_direct import extract_project_data
+from utils.html_parsing import find_candidate_blocks
+
+PATTERN = r'project|fond|programme'
+
+def make_deep_page(depth):
+    """Page WordPress pathologique : `depth` div imbriquées, toutes candidates"""
+    opening = ''.join(
+        f'<div class="programme-wrapper-{i}"><h4>Projet {i}</h4><p>Aide FEDER de {i + 1} 000 €.</p>'
+        for i in range(depth)
+    )
+    return f'<html><body>{opening}{"</div>" * depth}</body></html>'.encode('utf-8')
+
+def run(content, mode):
+    """Parse, sélectionne les blocs et extrait les projets ; retourne (projets, durée)"""
+    start = time.perf_counter()
+    sections = find_candidate_blocks(content, 'div', PATTERN, mode=mode)
+    projects = [p for p in (extract_project_data(section) for section in sections) if p]
+    return projects, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--depths', type=int, nargs='+', default=[250, 500, 1000, 2000])
+    args = parser.parse_args()
+
+    print(f"{'profondeur':>10} | {'all':>18} | {'outermost':>18} | {'innermost':>18} | {'items':>18}")
+    print('-' * 95)
+
+    for depth in args.depths:
+        content = make_deep_page(depth)
+        cells = []
+        for mode in ['all', 'outermost', 'innermost', 'items']:
+            projects, duree = run(content, mode)
+            cells.append(f"{len(projects):>5} p. {duree * 1000:>8.1f}ms")
+
+        print(f"{depth:>10} | " + ' | '.join(cells))
+
+if __name__ == '__main__':
+    main()
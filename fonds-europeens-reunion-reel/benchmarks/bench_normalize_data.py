@@ -0,0 +1,105 @@
+"""Benchmark de normalize_data : clean_data + validate_data d'origine contre la passe unique sur tableaux NumPy
+
+La passe unique inclut l'évaluation des règles de validation et leurs comptages par source.
+
+Utilisation (depuis le dossier du projet) :
+    python -m benchmarks.bench_normalize_data
+    python -m benchmarks.bench_normalize_data --sizes 100000 1000000 10000000 --skip-legacy-above 1000000
+
+Le temps par ligne de la passe unique doit rester constant d'une taille à
+l'autre (passage à l'échelle linéaire).
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_processor import (normalize_data, to_cents, PROGRAMMES, STATUTS, PROGRAMME_MAPPING, STATUT_MAPPING,
+                                  MONEY_COLUMNS, CATEGORY_COLUMNS, DATE_COLUMNS, MIN_MONTANT_CENTIMES,
+                                  MAX_MONTANT_CENTIMES)
+
+def legacy_normalize_data(df):
+    """clean_data puis validate_data d'origine (colonne par colonne, copies en chaîne), conservés pour comparaison"""
+
+    df = df.copy()
+    df['programme'] = df['programme'].map(PROGRAMME_MAPPING).fillna('FEDER').astype(PROGRAMMES)
+    for colonne, colonne_centimes in MONEY_COLUMNS.items():
+        position = df.columns.get_loc(colonne)
+        df.insert(position, colonne_centimes, to_cents(df.pop(colonne)))
+    df['taux_realisation'] = pd.to_numeric(df['taux_realisation'], errors='coerce').fillna(0).astype('float32')
+    df['montant_paye_centimes'] = np.minimum(df['montant_paye_centimes'], df['montant_total_centimes'])
+    df['statut'] = df['statut'].str.lower().map(STATUT_MAPPING).fillna('En cours').astype(STATUTS)
+    for colonne in CATEGORY_COLUMNS:
+        if colonne in df.columns:
+            df[colonne] = df[colonne].astype('category')
+    for colonne in DATE_COLUMNS:
+        if colonne in df.columns:
+            df[colonne] = pd.to_datetime(df[colonne], errors='coerce', format='%Y-%m-%d')
+
+    df = df[df['montant_total_centimes'] > MIN_MONTANT_CENTIMES]
+    df = df[df['montant_total_centimes'] < MAX_MONTANT_CENTIMES]
+    df['taux_realisation'] = df['taux_realisation'].clip(0, 100)
+    return df
+
+def make_frame(n_rows, seed=0):
+    """Génère un DataFrame brut de n_rows projets, texte au dtype inféré par pandas comme après pd.DataFrame(records)"""
+    rng = np.random.default_rng(seed)
+
+    def choice(valeurs):
+        return pd.Series(np.array(valeurs, dtype=object)[rng.integers(0, len(valeurs), size=n_rows)])
+
+    montants = rng.integers(0, 120_000_000, size=n_rows) / rng.choice([1, 100], size=n_rows)
+
+    return pd.DataFrame({
+        'id': choice([f"DG_{i:016x}" for i in range(100_000)]),
+        'programme': choice(['FEDER', 'FSE', 'FEADER', 'FSE+', 'INTERREG', 'ERDF', 'Autre']),
+        'secteur': choice(['Recherche', 'Transport', 'Formation', 'Environnement']),
+        'montant_total': montants,
+        'montant_paye': montants * 0.7,
+        'statut': choice(['En cours', 'terminé', 'Finalisation', 'completed', 'inconnu']),
+        'taux_realisation': rng.integers(-10, 120, size=n_rows),
+        'beneficiaire': choice([f"Bénéficiaire {i}" for i in range(2_000)]),
+        'date_debut': choice(['2022-01-01', '2023-01-01', '2023-06-15']),
+        'commune': choice(['Saint-Denis', 'Saint-Pierre', 'Le Tampon']),
+        'source': choice(['data.gouv.fr', 'Europe Direct', 'Région']),
+    })
+
+def timed(fonction, *args):
+    start = time.perf_counter()
+    result = fonction(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000, 10_000_000])
+    parser.add_argument('--skip-legacy-above', type=int, default=1_000_000,
+                        help="ne pas mesurer l'implémentation d'origine au-delà de ce nombre de lignes")
+    args = parser.parse_args()
+
+    print(f"{'lignes':>10} | {'origine (s)':>11} | {'passe unique (s)':>16} | {'ns/ligne':>8} | {'gain':>6}")
+    print('-' * 66)
+
+    for n_rows in args.sizes:
+        df = make_frame(n_rows)
+
+        (fused, rapport), t_fused = timed(normalize_data, df)
+        assert rapport['lignes'] - rapport['rejetees'] == len(fused)
+        par_ligne = t_fused / n_rows * 1e9
+
+        if n_rows > args.skip_legacy_above:
+            print(f"{n_rows:>10} | {'-':>11} | {t_fused:>16.3f} | {par_ligne:>8.0f} | {'-':>6}")
+            continue
+
+        legacy, t_legacy = timed(legacy_normalize_data, df)
+        assert len(legacy) == len(fused)
+        pd.testing.assert_frame_equal(legacy.reset_index(drop=True), fused, check_categorical=False)
+
+        print(f"{n_rows:>10} | {t_legacy:>11.3f} | {t_fused:>16.3f} | {par_ligne:>8.0f} | {t_legacy / t_fused:>5.1f}x")
+
+if __name__ == '__main__':
+    main()
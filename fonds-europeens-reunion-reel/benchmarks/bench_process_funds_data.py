@@ -0,0 +1,118 @@
+"""Benchmark de process_funds_data : colonnes objet d'origine contre schéma typé (catégories, centimes entiers)
+
+Utilisation (depuis le dossier du projet) :
+    python -m benchmarks.bench_process_funds_data
+    python -m benchmarks.bench_process_funds_data --sizes 100000 1000000
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_processor import process_funds_data
+
+def legacy_process_funds_data(raw_data):
+    """Implémentation d'origine (colonnes texte en objets Python), conservée pour comparaison"""
+
+    df = pd.DataFrame(raw_data)
+
+    programme_mapping = {'FEDER': 'FEDER', 'FSE': 'FSE', 'FEADER': 'FEADER', 'FSE+': 'FSE',
+                         'INTERREG': 'INTERREG', 'ERDF': 'FEDER', 'ESF': 'FSE'}
+    df['programme'] = df['programme'].map(programme_mapping).fillna('FEDER')
+    df['montant_total'] = pd.to_numeric(df['montant_total'], errors='coerce').fillna(0)
+    df['montant_paye'] = pd.to_numeric(df['montant_paye'], errors='coerce').fillna(0)
+    df['taux_realisation'] = pd.to_numeric(df['taux_realisation'], errors='coerce').fillna(0)
+    df['montant_paye'] = df[['montant_paye', 'montant_total']].min(axis=1)
+
+    statut_mapping = {'terminé': 'Terminé', 'en cours': 'En cours', 'finalisation': 'En finalisation',
+                      'en finalisation': 'En finalisation', 'completed': 'Terminé', 'in progress': 'En cours'}
+    df['statut'] = df['statut'].str.lower().map(statut_mapping).fillna('En cours')
+
+    df = df[df['montant_total'] > 1000]
+    df = df[df['montant_total'] < 100000000]
+    df['taux_realisation'] = df['taux_realisation'].clip(0, 100)
+
+    # Texte en objets Python, comme avant l'option de chaînes natives de pandas
+    texte = ['id', 'titre', 'programme', 'secteur', 'statut', 'beneficiaire', 'date_debut',
+             'date_fin_prevue', 'commune', 'source']
+    return df.astype({colonne: object for colonne in texte})
+
+def make_raw_data(n_rows, seed=0):
+    """Génère n_rows projets bruts répartis sur plusieurs territoires et sources"""
+    rng = np.random.default_rng(seed)
+
+    territoires = ['Réunion', 'Guadeloupe', 'Martinique', 'Guyane', 'Mayotte']
+    montants = rng.integers(2_000, 5_000_000, size=n_rows)
+
+    frame = pd.DataFrame({
+        'id': [f"DG_{i:016x}" for i in range(n_rows)],
+        'titre': 'Projet data.gouv.fr',
+        'programme': rng.choice(['FEDER', 'FSE', 'FEADER', 'FSE+', 'INTERREG', 'ERDF'], size=n_rows),
+        'secteur': rng.choice(['Recherche', 'Transport', 'Formation', 'Environnement', 'Santé', 'Numérique'], size=n_rows),
+        'montant_total': montants,
+        'montant_paye': montants * 0.7,
+        'statut': rng.choice(['En cours', 'terminé', 'Finalisation'], size=n_rows),
+        'taux_realisation': rng.integers(0, 101, size=n_rows),
+        'beneficiaire': [f"Bénéficiaire {i}" for i in rng.integers(0, 2_000, size=n_rows)],
+        'date_debut': '2023-01-01',
+        'date_fin_prevue': '2025-12-31',
+        'commune': rng.choice(territoires, size=n_rows),
+        'source': rng.choice([f"data.gouv.fr - {t}" for t in territoires] + ['Europe Direct', 'Région'], size=n_rows),
+    })
+    return frame.to_dict('records')
+
+def filter_and_aggregate(df, montant):
+    """Les opérations refaites par le tableau de bord à chaque interaction"""
+    programmes = list(df['programme'].unique())[:3]
+    secteurs = list(df['secteur'].unique())
+    statuts = list(df['statut'].unique())
+
+    filtre = df[
+        df['programme'].isin(programmes) &
+        df['secteur'].isin(secteurs) &
+        df['statut'].isin(statuts)
+    ]
+    filtre.groupby('programme', observed=True).agg({montant: 'sum', 'id': 'count'})
+    filtre.groupby('secteur', observed=True).agg({montant: 'sum', 'id': 'count'})
+    return filtre
+
+def timed(fonction, *args, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fonction(*args)
+    return result, (time.perf_counter() - start) / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--repeat', type=int, default=5, help="répétitions du filtre et des agrégations")
+    args = parser.parse_args()
+
+    print(f"{'lignes':>10} | {'octets/ligne':>21} | {'filtre+groupby (ms)':>21} | {'traitement (s)':>17}")
+    print(f"{'':>10} | {'objet':>10} {'typé':>10} | {'objet':>10} {'typé':>10} | {'objet':>8} {'typé':>8}")
+    print('-' * 80)
+
+    for n_rows in args.sizes:
+        raw_data = make_raw_data(n_rows)
+
+        legacy, t_legacy = timed(legacy_process_funds_data, raw_data)
+        typed, t_typed = timed(process_funds_data, raw_data)
+        assert len(legacy) == len(typed)
+        assert np.isclose(legacy['montant_total'].sum(), typed['montant_total_centimes'].sum() / 100)
+
+        _, f_legacy = timed(filter_and_aggregate, legacy, 'montant_total', repeat=args.repeat)
+        _, f_typed = timed(filter_and_aggregate, typed, 'montant_total_centimes', repeat=args.repeat)
+
+        m_legacy = legacy.memory_usage(deep=True).sum() / len(legacy)
+        m_typed = typed.memory_usage(deep=True).sum() / len(typed)
+
+        print(f"{n_rows:>10} | {m_legacy:>10.0f} {m_typed:>10.0f} | {f_legacy * 1000:>10.1f} {f_typed * 1000:>10.1f} | "
+              f"{t_legacy:>8.2f} {t_typed:>8.2f}")
+
+if __name__ == '__main__':
+    main()
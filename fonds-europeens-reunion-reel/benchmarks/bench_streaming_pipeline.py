@@ -0,0 +1,102 @@
+"""Benchmark du pipeline scraper -> traitement : liste de dicts d'origine contre flux de lots en colonnes
+
+Utilisation (depuis le dossier du projet) :
+    python -m benchmarks.bench_streaming_pipeline
+    python -m benchmarks.bench_streaming_pipeline --sizes 100000 1000000 3000000
+
+Chaque mesure est faite dans un processus séparé : la mémoire maximale
+(RSS) est celle du seul pipeline mesuré, imports déduits.
+"""
+
+import argparse
+import os
+import resource
+import subprocess
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.data_processor import process_funds_data, normalize_data
+from utils.resource_reader import CSV_CHUNKSIZE
+
+def source_stream(n_rows, seed=0):
+    """Source simulée façon data.gouv.fr : un DataFrame par morceau de fichier lu"""
+    rng = np.random.default_rng(seed)
+
+    for debut in range(0, n_rows, CSV_CHUNKSIZE):
+        n = min(CSV_CHUNKSIZE, n_rows - debut)
+        montants = rng.integers(2_000, 5_000_000, size=n).astype('float64')
+        yield pd.DataFrame({
+            'id': [f"DG_{i:016x}" for i in range(debut, debut + n)],
+            'titre': 'Projet Programme opérationnel FEDER-FSE',
+            'programme': rng.choice(['FEDER', 'FSE', 'FEADER', 'FSE+', 'INTERREG', 'ERDF'], size=n),
+            'secteur': rng.choice(['Recherche', 'Transport', 'Formation', 'Environnement'], size=n),
+            'montant_total': montants,
+            'montant_paye': montants * 0.8,
+            'statut': 'En cours',
+            'taux_realisation': 80,
+            'beneficiaire': [f"Bénéficiaire {i}" for i in rng.integers(0, 2_000, size=n)],
+            'date_debut': '2023-01-01',
+            'date_fin_prevue': '2025-12-31',
+            'commune': 'La Réunion',
+            'source': 'data.gouv.fr - Programme opérationnel FEDER-FSE'
+        })
+
+def legacy_pipeline(n_rows):
+    """Chemin d'origine : morceaux concaténés, liste de dicts, puis DataFrame de la liste"""
+    records = pd.concat(list(source_stream(n_rows)), ignore_index=True).to_dict('records')
+    all_data = []
+    all_data.extend(records)
+    del records
+    df, _ = normalize_data(pd.DataFrame(all_data))
+    return df
+
+def streaming_pipeline(n_rows):
+    """Chemin en flux : les lots produits par la source sont rangés en colonnes au fil de l'eau"""
+    return process_funds_data(source_stream(n_rows))
+
+PIPELINES = {'origine': legacy_pipeline, 'flux': streaming_pipeline}
+
+def run_one(nom, n_rows):
+    """Exécute un pipeline dans ce processus ; affiche 'lignes secondes Mo'"""
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    df = PIPELINES[nom](n_rows)
+    duree = time.perf_counter() - start
+    pic = (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base) / 1024
+    print(len(df), duree, pic)
+
+def measure(nom, n_rows):
+    sortie = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_streaming_pipeline', '--run', nom, str(n_rows)],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        capture_output=True, text=True, check=True
+    ).stdout.split()
+    return int(sortie[0]), float(sortie[1]), float(sortie[2])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000])
+    parser.add_argument('--run', nargs=2, metavar=('PIPELINE', 'LIGNES'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        run_one(args.run[0], int(args.run[1]))
+        return
+
+    print(f"{'lignes':>10} | {'pic mémoire (Mo)':>19} | {'durée (s)':>15}")
+    print(f"{'':>10} | {'origine':>9} {'flux':>9} | {'origine':>7} {'flux':>7}")
+    print('-' * 52)
+
+    for n_rows in args.sizes:
+        lignes_origine, t_origine, m_origine = measure('origine', n_rows)
+        lignes_flux, t_flux, m_flux = measure('flux', n_rows)
+        assert lignes_origine == lignes_flux
+
+        print(f"{n_rows:>10} | {m_origine:>9.0f} {m_flux:>9.0f} | {t_origine:>7.2f} {t_flux:>7.2f}")
+
+if __name__ == '__main__':
+    main()
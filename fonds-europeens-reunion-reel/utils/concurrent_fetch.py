@@ -0,0 +1,64 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# Échéance par défaut des sources (en secondes), pour un chargement interactif
+DEFAULT_DEADLINE = 25
+
+def fetch_all_sources(sources, deadline=DEFAULT_DEADLINE):
+    """Exécute toutes les sources en parallèle et fusionne ce qui est revenu avant l'échéance
+
+    `sources` est une liste de tuples (nom, fonction sans argument), ou
+    (nom, fonction, échéance propre en secondes) pour une source qui dispose
+    d'un autre délai que `deadline`.
+    Retourne une liste de résultats dans l'ordre des sources, chacun sous la forme
+    {'nom', 'donnees', 'erreur', 'duree'} ; une source qui dépasse son échéance
+    est signalée avec erreur='timeout' et donnees=None.
+    """
+
+    if not sources:
+        return []
+
+    executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="source")
+    start = time.monotonic()
+
+    futures = {}
+    for nom, fonction, *_ in sources:
+        futures[nom] = executor.submit(_run_source, fonction)
+
+    # Chaque source est attendue jusqu'à sa propre échéance, les plus proches d'abord
+    echeances = {source[0]: start + (source[2] if len(source) > 2 else deadline) for source in sources}
+    for nom in sorted(echeances, key=echeances.get):
+        wait([futures[nom]], timeout=max(0, echeances[nom] - time.monotonic()))
+
+    # Ne pas attendre les sources en retard : elles finissent en arrière-plan
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    results = []
+    for nom, *_ in sources:
+        future = futures[nom]
+        if not future.done():
+            results.append({
+                'nom': nom,
+                'donnees': None,
+                'erreur': 'timeout',
+                'duree': time.monotonic() - start
+            })
+            continue
+
+        donnees, erreur, duree = future.result()
+        results.append({
+            'nom': nom,
+            'donnees': donnees,
+            'erreur': erreur,
+            'duree': duree
+        })
+
+    return results
+
+def _run_source(fonction):
+    """Exécute une source en capturant son exception et sa durée"""
+    start = time.monotonic()
+    try:
+        return fonction(), None, time.monotonic() - start
+    except Exception as e:
+        return None, str(e), time.monotonic() - start
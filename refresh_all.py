@@ -0,0 +1,108 @@
+"""Rafraîchissement des snapshots de tous les territoires
+
+Utilisation (depuis la racine du dépôt) :
+    python refresh_all.py                                   # une construction par territoire
+    python refresh_all.py --territory all --every 30m       # service continu
+    python refresh_all.py --territory Guyane Martinique --every 1h
+    python refresh_all.py --territory Guyane --source "data.gouv.fr"   # une source, un territoire
+
+Chaque dossier de territoire a ses propres modules scraper/ et utils/ :
+un processus `python refresh.py` est donc lancé par territoire, dans son
+dossier. En mode continu, un processus qui s'arrête est relancé.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Dossiers de territoire : ceux qui contiennent un refresh.py
+TERRITOIRES = sorted(
+    nom for nom in os.listdir(ROOT)
+    if os.path.isfile(os.path.join(ROOT, nom, 'refresh.py'))
+)
+
+# Délai avant de relancer un processus de territoire arrêté (en secondes)
+RESTART_DELAY = 30
+
+def start(territoire, every, sources=None):
+    """Lance refresh.py dans le dossier du territoire"""
+    commande = [sys.executable, 'refresh.py']
+    if every:
+        commande += ['--every', every]
+    if sources:
+        commande += ['--source', *sources]
+    return subprocess.Popen(commande, cwd=os.path.join(ROOT, territoire))
+
+def run_once(territoires, jobs, sources=None):
+    """Une construction par territoire, au plus `jobs` en parallèle ; retourne les territoires en échec"""
+    en_attente = list(territoires)
+    en_cours = {}
+    echecs = []
+
+    while en_attente or en_cours:
+        while en_attente and len(en_cours) < jobs:
+            territoire = en_attente.pop(0)
+            en_cours[territoire] = start(territoire, None, sources)
+
+        time.sleep(0.5)
+        for territoire, process in list(en_cours.items()):
+            if process.poll() is not None:
+                del en_cours[territoire]
+                if process.returncode != 0:
+                    echecs.append(territoire)
+
+    return echecs
+
+def supervise(territoires, every):
+    """Garde un processus refresh.py --every par territoire, relancé s'il s'arrête"""
+    processes = {territoire: start(territoire, every) for territoire in territoires}
+    arrets = {}
+
+    try:
+        while True:
+            time.sleep(1)
+            for territoire, process in processes.items():
+                if process.poll() is None:
+                    continue
+                arret = arrets.setdefault(territoire, time.monotonic())
+                if time.monotonic() - arret >= RESTART_DELAY:
+                    print(f"Relance du rafraîchissement {territoire} (code {process.returncode})")
+                    processes[territoire] = start(territoire, every)
+                    del arrets[territoire]
+    except KeyboardInterrupt:
+        for process in processes.values():
+            process.terminate()
+        for process in processes.values():
+            process.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--territory', nargs='+', default=['all'], help=f"all ou parmi : {', '.join(TERRITOIRES)}")
+    parser.add_argument('--every', help="intervalle entre deux constructions (ex. 30m) ; sans lui, une seule passe")
+    parser.add_argument('--jobs', type=int, default=4, help="territoires construits en parallèle en mode une passe")
+    parser.add_argument('--source', nargs='+', metavar='NOM', help="sources à réinterroger même si elles sont fraîches (ex. data.gouv.fr)")
+    args = parser.parse_args()
+
+    territoires = TERRITOIRES if 'all' in args.territory else args.territory
+    inconnus = [t for t in territoires if t not in TERRITOIRES]
+    if inconnus:
+        parser.error(f"territoire inconnu : {', '.join(inconnus)}")
+
+    if args.every:
+        if args.source:
+            parser.error("--source s'utilise pour une passe unique, sans --every")
+        supervise(territoires, args.every)
+        return 0
+
+    echecs = run_once(territoires, args.jobs, args.source)
+    if echecs:
+        print(f"Échec du rafraîchissement : {', '.join(echecs)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())